@@ -0,0 +1,104 @@
+from argparse import ArgumentParser
+from json import dump, load
+from os.path import abspath, dirname, join
+from shutil import rmtree
+from statistics import median
+from subprocess import run
+from sys import executable, exit
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+#=======================
+#=======================
+REPOSITORY_ROOT = dirname(dirname(abspath(__file__)))
+EXAMPLE_ACTION_SPACE = join(REPOSITORY_ROOT, "examples", "examples_with_racing_car", "rule-based-race-car", "racecar_actions.csv")
+
+TIMED_SNIPPET = """
+from time import perf_counter
+start_time = perf_counter()
+{setup}
+elapsed_time = perf_counter() - start_time
+print(elapsed_time)
+"""
+
+IMPORT_SCENARIOS = {
+    "import_leen_rl": "import leen_rl",
+    "import_core_classes": "from leen_rl import Agent, RLExperiment, Environment, Sensor, CognitiveMap, RandomExploration",
+    "load_action_space_uncached": "from leen_rl import load_in_action_space\nload_in_action_space({path!r}, use_cache=False)",
+    "load_action_space_cached": "from leen_rl import load_in_action_space\nload_in_action_space({path!r})",
+}
+
+def time_snippet_in_fresh_interpreter(setup:str) -> float:
+    completed_process = run(
+        [executable, "-c", TIMED_SNIPPET.format(setup=setup)],
+        capture_output = True,
+        text = True,
+        check = True,
+        cwd = REPOSITORY_ROOT,
+    )
+    return float(completed_process.stdout.strip().splitlines()[-1])
+
+def run_benchmarks(number_of_repeats:int) -> List[Dict[str,object]]:
+    results = []
+    with TemporaryDirectory() as directory:
+        action_space_path = join(directory, "actions.csv")
+        with open(EXAMPLE_ACTION_SPACE) as source_file, open(action_space_path, "w") as copy_file:
+            copy_file.write(source_file.read())
+        time_snippet_in_fresh_interpreter(IMPORT_SCENARIOS["load_action_space_cached"].format(path=action_space_path))
+
+        for name, setup in IMPORT_SCENARIOS.items():
+            timings = [
+                time_snippet_in_fresh_interpreter(setup.format(path=action_space_path))
+                for _ in range(number_of_repeats)
+            ]
+            results.append(
+                {
+                    "case": name,
+                    "median_seconds": median(timings),
+                    "min_seconds": min(timings),
+                    "max_seconds": max(timings),
+                }
+            )
+            print(f"{name:<28} median={median(timings)*1e3:8.2f}ms min={min(timings)*1e3:8.2f}ms")
+        rmtree(join(directory, "__pycache__"), ignore_errors=True)
+    return results
+
+def find_regressions(
+    results:List[Dict[str,object]],
+    baseline:List[Dict[str,object]],
+    tolerance:float,
+) -> List[str]:
+    baseline_by_case = {result["case"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_case.get(result["case"])
+        if baseline_result is None:
+            continue
+        if result["median_seconds"] > baseline_result["median_seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{result['case']}: {result['median_seconds']*1e3:.2f}ms "
+                f"> {baseline_result['median_seconds']*1e3:.2f}ms baseline"
+            )
+    return regressions
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="leen_rl import and action space start-up benchmark")
+    parser.add_argument("--output", default="import_time_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=.25)
+    parser.add_argument("--repeats", type=int, default=15)
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(number_of_repeats=arguments.repeats)
+    with open(arguments.output, "w") as output_file:
+        dump({"results": results}, output_file, indent=4)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            regressions = find_regressions(
+                results = results,
+                baseline = load(baseline_file)["results"],
+                tolerance = arguments.tolerance,
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        exit(1 if regressions else 0)
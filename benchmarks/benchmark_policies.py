@@ -0,0 +1,225 @@
+from argparse import ArgumentParser
+from json import dump, load
+from math import hypot, cos, sin, radians
+from os.path import join
+from platform import python_version
+from sys import exit
+from tempfile import TemporaryDirectory
+from tracemalloc import start as start_tracing_memory, stop as stop_tracing_memory, get_traced_memory
+from typing import Callable, Dict, List, NamedTuple, Optional
+#=======================
+from leen_rl import Agent
+from leen_rl import RLExperiment
+from leen_rl import Environment
+from leen_rl import Sensor
+from leen_rl import Policy
+from leen_rl import PolicyFunction
+from leen_rl import QFunction
+from leen_rl import ValueFunction
+from leen_rl import GoalPlanning
+from leen_rl import RandomExploration
+from leen_rl import StepProfiler
+from leen_rl import Action
+from leen_rl import BeliefState
+from synthetic_environments import GridWorld, GridSense, KinematicsWorld, KinematicsSense
+from synthetic_environments import PixelWorld, PixelSense, PassThroughMind
+#=======================
+
+class GridPolicyFunction(PolicyFunction):
+    def infer_action(self, belief_state:BeliefState) -> Action:
+        x, y = belief_state.position
+        return self.action_space[(x + y) % len(self.action_space)]
+
+class GridQFunction(QFunction):
+    def infer_action_value(self, belief_state:BeliefState, action:Action) -> float:
+        x, y = belief_state.position
+        goal_x, goal_y = belief_state.goal
+        return -abs(goal_x - x - action.turn) - abs(goal_y - y - action.acceleration)
+
+class KinematicsModel:
+    target = (150., -50.)
+
+    def infer_reward(self, belief_state:BeliefState) -> float:
+        x, y = belief_state.position
+        return -hypot(x - self.target[0], y - self.target[1])
+
+    def infer_belief_state(self, action:Action, belief_state:BeliefState) -> BeliefState:
+        x, y = belief_state.position
+        theta = radians(belief_state.heading)
+        return belief_state.evolve(
+            velocity = belief_state.velocity + action.acceleration,
+            heading = belief_state.heading + action.turn,
+            position = (x + cos(theta)*belief_state.velocity, y + sin(theta)*belief_state.velocity),
+        )
+
+class KinematicsValueFunction(KinematicsModel, ValueFunction):
+    def infer_state_value(self, belief_state:BeliefState) -> float:
+        return self.infer_reward(belief_state)
+
+class KinematicsGoalPlanning(KinematicsModel, GoalPlanning):
+    pass
+
+class BenchmarkCase(NamedTuple):
+    name:str
+    environment:Callable[[], Environment]
+    sensor:Callable[[], Sensor]
+    policy:Callable[[str, int], Policy]
+    uses_planning_depth:bool = False
+
+BENCHMARK_CASES = (
+    BenchmarkCase("random_exploration/grid", GridWorld, GridSense, lambda path, depth: RandomExploration(action_space_path=path)),
+    BenchmarkCase("random_exploration/pixels", PixelWorld, PixelSense, lambda path, depth: RandomExploration(action_space_path=path)),
+    BenchmarkCase("policy_function/grid", GridWorld, GridSense, lambda path, depth: GridPolicyFunction(action_space_path=path)),
+    BenchmarkCase("q_function/grid", GridWorld, GridSense, lambda path, depth: GridQFunction(action_space_path=path)),
+    BenchmarkCase("value_function/kinematics", KinematicsWorld, KinematicsSense, lambda path, depth: KinematicsValueFunction(action_space_path=path)),
+    BenchmarkCase(
+        "goal_planning/kinematics", KinematicsWorld, KinematicsSense,
+        lambda path, depth: KinematicsGoalPlanning(action_space_path=path, max_depth=depth, sample_size=2),
+        uses_planning_depth = True,
+    ),
+)
+
+def write_action_space(directory:str, number_of_actions:int) -> str:
+    path = join(directory, f"actions_{number_of_actions}.csv")
+    with open(path, "w") as action_file:
+        action_file.write("turn,acceleration\n")
+        for index in range(number_of_actions):
+            turn = -1 + 2*index/max(number_of_actions - 1, 1)
+            acceleration = -1 + 2*((index*7) % number_of_actions)/max(number_of_actions - 1, 1)
+            action_file.write(f"{turn},{acceleration}\n")
+    return path
+
+def build_experiment(case:BenchmarkCase, action_space_path:str, planning_depth:int, profiler:Optional[StepProfiler]) -> RLExperiment:
+    return RLExperiment(
+        environment = case.environment(),
+        agent = Agent(
+            sensor = case.sensor(),
+            cognitive_map = PassThroughMind(),
+            policy = case.policy(action_space_path, planning_depth),
+        ),
+        verbose = False,
+        profiler = profiler,
+    )
+
+def run_case(
+    case:BenchmarkCase,
+    action_space_path:str,
+    action_space_size:int,
+    planning_depth:Optional[int],
+    number_of_steps:int,
+    number_of_memory_steps:int,
+) -> Dict[str,object]:
+    profiler = StepProfiler()
+    build_experiment(
+        case = case,
+        action_space_path = action_space_path,
+        planning_depth = planning_depth,
+        profiler = profiler,
+    ).run(number_of_steps)
+    step_timer = profiler.phase_timers["step"]
+
+    start_tracing_memory()
+    build_experiment(
+        case = case,
+        action_space_path = action_space_path,
+        planning_depth = planning_depth,
+        profiler = None,
+    ).run(number_of_memory_steps)
+    _, peak_memory = get_traced_memory()
+    stop_tracing_memory()
+
+    return {
+        "case": case.name,
+        "action_space_size": action_space_size,
+        "planning_depth": planning_depth,
+        "steps": number_of_steps,
+        "steps_per_second": profiler.steps_per_second(),
+        "p50_step_seconds": step_timer.percentile(.5),
+        "p99_step_seconds": step_timer.percentile(.99),
+        "peak_memory_bytes": peak_memory,
+    }
+
+def run_benchmarks(
+    action_space_sizes:List[int],
+    planning_depths:List[int],
+    number_of_steps:int,
+    number_of_planning_steps:int,
+    number_of_memory_steps:int,
+) -> List[Dict[str,object]]:
+    results = []
+    with TemporaryDirectory() as directory:
+        for action_space_size in action_space_sizes:
+            action_space_path = write_action_space(directory=directory, number_of_actions=action_space_size)
+            for case in BENCHMARK_CASES:
+                for planning_depth in (planning_depths if case.uses_planning_depth else [None]):
+                    result = run_case(
+                        case = case,
+                        action_space_path = action_space_path,
+                        action_space_size = action_space_size,
+                        planning_depth = planning_depth,
+                        number_of_steps = number_of_planning_steps if case.uses_planning_depth else number_of_steps,
+                        number_of_memory_steps = min(number_of_memory_steps, number_of_planning_steps) if case.uses_planning_depth else number_of_memory_steps,
+                    )
+                    print(
+                        f"{result['case']:<28} actions={action_space_size:<6} depth={str(planning_depth):<5} "
+                        f"{result['steps_per_second']:>10.1f} steps/sec "
+                        f"p99={result['p99_step_seconds']*1e3:.3f}ms "
+                        f"peak={result['peak_memory_bytes']/1024:.0f}KiB"
+                    )
+                    results.append(result)
+    return results
+
+def _result_key(result:Dict[str,object]) -> tuple:
+    return (result["case"], result["action_space_size"], result["planning_depth"])
+
+def find_regressions(
+    results:List[Dict[str,object]],
+    baseline:List[Dict[str,object]],
+    tolerance:float,
+) -> List[str]:
+    baseline_by_key = {_result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        baseline_result = baseline_by_key.get(_result_key(result))
+        if baseline_result is None:
+            continue
+        minimum_speed = baseline_result["steps_per_second"] * (1 - tolerance)
+        if result["steps_per_second"] < minimum_speed:
+            regressions.append(
+                f"{_result_key(result)}: {result['steps_per_second']:.1f} steps/sec "
+                f"< {baseline_result['steps_per_second']:.1f} baseline"
+            )
+    return regressions
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="headless leen_rl policy benchmarks")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=.2)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--planning-steps", type=int, default=50)
+    parser.add_argument("--memory-steps", type=int, default=200)
+    parser.add_argument("--action-space-sizes", type=int, nargs="+", default=[4, 64, 1024])
+    parser.add_argument("--planning-depths", type=int, nargs="+", default=[1, 3, 5])
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(
+        action_space_sizes = arguments.action_space_sizes,
+        planning_depths = arguments.planning_depths,
+        number_of_steps = arguments.steps,
+        number_of_planning_steps = arguments.planning_steps,
+        number_of_memory_steps = arguments.memory_steps,
+    )
+    with open(arguments.output, "w") as output_file:
+        dump({"python_version": python_version(), "results": results}, output_file, indent=4)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            regressions = find_regressions(
+                results = results,
+                baseline = load(baseline_file)["results"],
+                tolerance = arguments.tolerance,
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        exit(1 if regressions else 0)
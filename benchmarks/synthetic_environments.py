@@ -0,0 +1,93 @@
+from math import cos, sin, radians, hypot
+from typing import Optional, Tuple
+from numpy import ndarray
+from numpy.random import default_rng
+#=======================
+from leen_rl import Environment
+from leen_rl import Sensor
+from leen_rl import CognitiveMap
+from leen_rl import Action
+from leen_rl import Observation
+from leen_rl import BeliefState
+#=======================
+
+class GridWorld(Environment):
+    size = 32
+
+    def initialise_state(self) -> None:
+        self.position = (0, 0)
+        self.goal = (self.size - 1, self.size - 1)
+        self.reward = 0.
+
+    def update_state(self, action:Action) -> None:
+        x, y = self.position
+        x = min(max(x + round(action.turn), 0), self.size - 1)
+        y = min(max(y + round(action.acceleration), 0), self.size - 1)
+        self.position = (x, y)
+        self.reward = float(self.position == self.goal)
+        if self.reward:
+            self.position = (0, 0)
+
+    def get_reward(self) -> float:
+        return self.reward
+
+class GridSense(Sensor):
+    def get_observation(self, state:Environment) -> Observation:
+        return Observation(
+            position = state.position,
+            goal = state.goal,
+        )
+
+class KinematicsWorld(Environment):
+    def initialise_state(self) -> None:
+        self.position = (0., 0.)
+        self.heading = 0.
+        self.velocity = 0.
+        self.target = (150., -50.)
+        self.step_size = 10
+
+    def update_state(self, action:Action) -> None:
+        self.velocity += action.acceleration
+        self.heading += action.turn*self.step_size
+        x, y = self.position
+        theta = radians(self.heading)
+        self.position = (x + cos(theta)*self.velocity, y + sin(theta)*self.velocity)
+
+    def get_reward(self) -> float:
+        return -hypot(self.position[0] - self.target[0], self.position[1] - self.target[1])
+
+class KinematicsSense(Sensor):
+    def get_observation(self, state:Environment) -> Observation:
+        return Observation(
+            position = state.position,
+            heading = state.heading,
+            velocity = state.velocity,
+        )
+
+class PixelWorld(Environment):
+    frame_shape:Tuple[int,int,int] = (96, 96, 3)
+
+    def initialise_state(self) -> None:
+        self.random_generator = default_rng(0)
+        self.pixels = self._render_frame()
+
+    def update_state(self, action:Action) -> None:
+        self.pixels = self._render_frame()
+
+    def _render_frame(self) -> ndarray:
+        return self.random_generator.integers(0, 256, size=self.frame_shape, dtype="uint8")
+
+class PixelSense(Sensor):
+    def get_observation(self, state:Environment) -> Observation:
+        return Observation(
+            pixels = state.pixels,
+        )
+
+class PassThroughMind(CognitiveMap):
+    def get_belief_state(
+        self,
+        observation:Observation,
+        previous_belief_state:Optional[BeliefState] = None,
+        previous_action:Optional[Action] = None
+    ) -> BeliefState:
+        return BeliefState(**observation.__dict__)
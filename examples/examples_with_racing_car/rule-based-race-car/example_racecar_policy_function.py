@@ -1,8 +1,5 @@
 from gym import make
-from typing import Optional, Tuple, List
-from numpy import asarray
-from PIL import Image
-from scipy.spatial.distance import cosine
+from typing import Optional, List
 #=======================
 from leen_rl import Agent
 from leen_rl import RLExperiment
@@ -10,6 +7,8 @@ from leen_rl import Environment
 from leen_rl import Sensor
 from leen_rl import CognitiveMap
 from leen_rl import PolicyFunction
+from leen_rl import PixelPreprocessor
+from leen_rl import PrototypeClassifier
 from leen_rl import Action
 from leen_rl import Observation
 from leen_rl import BeliefState
@@ -34,40 +33,14 @@ class DriverView(Sensor):
         )
 
 class DriverMind(CognitiveMap):
-    def _reduce_size_of_pixels(
-        self,
-        pixels:List[List[List[float]]],
-        reduced_size:Tuple[int,int],
-    ) -> List[List[List[float]]]:
+    preprocessor = PixelPreprocessor(
+        input_shape = (96,96,3),
+        output_size = (8,8),
+        crop = (0,15,0,0),
+    )
 
-        return asarray(
-            Image.fromarray(pixels).resize(reduced_size)
-        )
-
-    def _flatten_rgb_channels(
-        self,
-        pixels:List[List[List[float]]],
-        rgb_channel_weights:Tuple[float,float,float] = (.2989,.587,.114),
-    ) -> List[List[float]]:
-        return sum(
-            rgb_channel_weights[index]*pixels[:,:,index] for index in range(3)
-        )
-    
-    def _normalise_pixels(self,pixels:List[List[float]]) -> List[List[float]]:
-        return pixels * 1/255
-    
-    def _feature_engineer_map(self,pixels:List[List[List[float]]]) -> List[List[float]]:
-        return self._normalise_pixels(
-            pixels = self._flatten_rgb_channels(
-                pixels = self._reduce_size_of_pixels(
-                    pixels=pixels, 
-                    reduced_size=(8,8)
-                )
-            )
-        )
-
-    def _identify_road_from_pixels(self, pixels:List[float]) -> str:
-        pixel_features = {
+    road_classifier = PrototypeClassifier(
+        prototypes = {
             "STRAIGHT_ROAD" : [
                 1, 1, 1, 0, 0, 1, 1, 1,
                 1, 1, 1, 0, 0, 1, 1, 1,
@@ -118,14 +91,14 @@ class DriverMind(CognitiveMap):
                 1, 1, 1, 1, 0, 0, 1, 1,
                 1, 1, 1, 1, 0, 0, 1, 1,
             ],
-        }
-        return min(
-            pixel_features.keys(),
-            key = lambda feature_name: cosine(
-                u = pixel_features.get(feature_name),
-                v = pixels
-            )
-        )
+        },
+    )
+
+    def _feature_engineer_map(self,pixels:List[List[List[float]]]) -> List[List[float]]:
+        return self.preprocessor.process(frame=pixels).copy()
+
+    def _identify_road_from_pixels(self, pixels:List[float]) -> str:
+        return self.road_classifier.classify(features=pixels).label
 
     def get_belief_state(
         self, 
@@ -134,7 +107,7 @@ class DriverMind(CognitiveMap):
         previous_action:Optional[Action]=None
     ) -> BeliefState:
         
-        reduced_pixels = self._feature_engineer_map(pixels=observation.pixels[:-15,:,:])
+        reduced_pixels = self._feature_engineer_map(pixels=observation.pixels)
         reduced_flattened_pixels = reduced_pixels.flatten()
         return BeliefState(
             previous_turn = previous_action.steer if previous_action else 0,
@@ -1,10 +1,13 @@
-from typing import Optional, Dict, List, Tuple
-from pandas import DataFrame, Index
-from PIL.Image import fromarray
-from numpy import asarray
+from typing import Optional, Dict, List
+from pandas import DataFrame
 #=======================
-from leen_rl import CognitiveMap, Action, Observation, BeliefState
+from leen_rl import CognitiveMap, Action, Observation, BeliefState, PixelPreprocessor
 #=======================
+PIXEL_PREPROCESSOR = PixelPreprocessor(
+    input_shape = (96,96,3),
+    output_size = (8,8),
+)
+
 class DriverMind(CognitiveMap):
     
     def get_belief_state(
@@ -86,42 +89,4 @@ def embed_batch_of_pixels(batch_of_pixels:List[List[List[List[float]]]]) -> Data
     ) 
 
 def embed_pixels(pixels:List[List[List[float]]]) -> List[float]:
-    return mini_greyscale_version(
-        pixels=pixels,
-        reduced_size = (8,8)
-    ).flatten()
-
-def mini_greyscale_version(
-    pixels:List[List[List[float]]], 
-    reduced_size:Tuple[int,int],
-) -> List[List[float]]:
-
-    return normalise_pixels(
-        pixels = flatten_rgb_channels(
-            pixels = reduce_size_of_pixels(
-                pixels=pixels, 
-                reduced_size=reduced_size
-            )
-        )
-    )
-
-def normalise_pixels(pixels:List[List[float]]) -> List[List[float]]:
-    return pixels * 1/255
-
-def flatten_rgb_channels(
-    pixels:List[List[List[float]]],
-    rgb_channel_weights:Tuple[float,float,float] = (.2989,.587,.114),
-) -> List[List[float]]:
-
-    return sum(
-        rgb_channel_weights[index]*pixels[:,:,index] for index in range(3)
-    )
-
-def reduce_size_of_pixels(
-    pixels:List[List[List[float]]],
-    reduced_size:Tuple[int,int],
-) -> List[List[List[float]]]:
-
-    return asarray(
-        fromarray(pixels).resize(reduced_size)
-    )
\ No newline at end of file
+    return PIXEL_PREPROCESSOR.process(frame=pixels).flatten()
@@ -1,5 +1,4 @@
 from turtle import Screen, Turtle
-from copy import deepcopy
 from math import cos, sin, radians
 from scipy.spatial.distance import euclidean
 from typing import Optional, List
@@ -79,16 +78,16 @@ class TurtleAct(GoalPlanning):
         x_next = x + (cos(theta)*belief_state.velocity)
         y_next = y + (sin(theta)*belief_state.velocity)
 
-        next_belief_state = deepcopy(belief_state)
-        next_belief_state.acceleration = action.acceleration 
-        next_belief_state.turn = action.turn 
-        next_belief_state.previous_velocity = belief_state.velocity
-        next_belief_state.previous_heading = belief_state.heading 
-        next_belief_state.previous_position = belief_state.position
-        next_belief_state.velocity = belief_state.velocity + action.acceleration
-        next_belief_state.heading = belief_state.heading + action.turn
-        next_belief_state.position = (x_next, y_next)
-        return next_belief_state 
+        return belief_state.evolve(
+            acceleration = action.acceleration,
+            turn = action.turn,
+            previous_velocity = belief_state.velocity,
+            previous_heading = belief_state.heading,
+            previous_position = belief_state.position,
+            velocity = belief_state.velocity + action.acceleration,
+            heading = belief_state.heading + action.turn,
+            position = (x_next, y_next),
+        )
 
 RLExperiment(
     environment = TurtleWorld(),
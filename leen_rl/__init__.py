@@ -1,7 +1,78 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+#=======================
+_LAZY_EXPORTS = {
+    ".agent_experiment": ("Agent", "RLExperiment", "VectorisedRLExperiment", "PipelinedRLExperiment"),
+    ".environment_sensor_map": ("Environment", "Sensor", "CognitiveMap"),
+    ".state_action": (
+        "BeliefState", "Observation", "Action", "ActionSpace", "load_in_action_space",
+        "StructuredState", "StructuredBeliefState", "StructuredObservation",
+    ),
+    ".policy_approximator": (
+        "Policy", "PolicyFunction", "QFunction", "ValueFunction", "π", "φ", "V", "Q", "MemoisedApproximator",
+    ),
+    ".predefined_policies": (
+        "RandomExploration", "GoalPlanning", "MonteCarloTreeSearch", "BatchedRolloutPlanning",
+        "ELMPolicyFunction", "ELMQFunction", "TabularQLearning",
+    ),
+    ".state_indexing": ("MixedRadixEncoder",),
+    ".history": ("SlidingWindow",),
+    ".pixel_preprocessing": ("PixelPreprocessor", "PreprocessedSensor"),
+    ".machine_learning_models.prototype_classifier": ("PrototypeClassifier", "PrototypeMatch"),
+    ".replay_buffer": ("ReplayBuffer", "PrioritisedReplayBuffer", "Transitions"),
+    ".step_profiler": ("StepProfiler", "PhaseTimer"),
+    ".background_renderer": ("BackgroundRenderer",),
+    ".object_state": ("find_object_state",),
+    ".checkpoint": ("ExperimentCheckpoint",),
+    ".shared_frames": ("SharedFrameRing", "SharedFrameSensor", "StaleFrameError"),
+    ".actor_learner": ("ActorLearner", "TransitionStreamer", "get_policy_parameters", "set_policy_parameters"),
+    ".parallel_rollouts": ("ParallelRollouts", "RolloutTask", "RolloutResult"),
+    ".async_experiment": (
+        "AsyncEnvironment", "AsyncSensor", "AsyncPolicy", "AsyncAgent", "AsyncRLExperiment",
+        "ThreadOffloadedEnvironment", "ThreadOffloadedSensor", "ThreadOffloadedPolicy",
+        "run_experiments_concurrently",
+    ),
+    ".session_server": ("SessionServer", "ConversationSession", "FakeClient"),
+}
+_MODULE_OF_EXPORT = {
+    name: module for module, names in _LAZY_EXPORTS.items() for name in names
+}
+__all__ = list(_MODULE_OF_EXPORT)
+
+def __getattr__(name:str) -> Any:
+    module = _MODULE_OF_EXPORT.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+if TYPE_CHECKING:
+    from .agent_experiment import Agent, RLExperiment, VectorisedRLExperiment, PipelinedRLExperiment
+    from .environment_sensor_map import Environment, Sensor, CognitiveMap
+    from .state_action import BeliefState, Observation, Action, ActionSpace, load_in_action_space
+    from .state_action import StructuredState, StructuredBeliefState, StructuredObservation
+    from .policy_approximator import Policy, PolicyFunction, QFunction, ValueFunction, π, φ, V, Q
+    from .policy_approximator import MemoisedApproximator
+    from .predefined_policies import RandomExploration, GoalPlanning, MonteCarloTreeSearch, BatchedRolloutPlanning
+    from .predefined_policies import ELMPolicyFunction, ELMQFunction, TabularQLearning
+    from .state_indexing import MixedRadixEncoder
+    from .history import SlidingWindow
+    from .pixel_preprocessing import PixelPreprocessor, PreprocessedSensor
+    from .machine_learning_models.prototype_classifier import PrototypeClassifier, PrototypeMatch
+    from .replay_buffer import ReplayBuffer, PrioritisedReplayBuffer, Transitions
+    from .step_profiler import StepProfiler, PhaseTimer
+    from .background_renderer import BackgroundRenderer
+    from .object_state import find_object_state
+    from .checkpoint import ExperimentCheckpoint
+    from .shared_frames import SharedFrameRing, SharedFrameSensor, StaleFrameError
+    from .actor_learner import ActorLearner, TransitionStreamer, get_policy_parameters, set_policy_parameters
+    from .parallel_rollouts import ParallelRollouts, RolloutTask, RolloutResult
+    from .async_experiment import AsyncEnvironment, AsyncSensor, AsyncPolicy, AsyncAgent, AsyncRLExperiment
+    from .async_experiment import ThreadOffloadedEnvironment, ThreadOffloadedSensor, ThreadOffloadedPolicy
+    from .async_experiment import run_experiments_concurrently
+    from .session_server import SessionServer, ConversationSession, FakeClient
 #=======================
-from .agent_experiment import Agent, RLExperiment
-from .environment_sensor_map import Environment, Sensor, CognitiveMap
-from .state_action import BeliefState, Observation, Action, load_in_action_space
-from .policy_approximator import Policy, PolicyFunction, QFunction, ValueFunction, π, φ, V, Q
-from .predefined_policies import RandomExploration, GoalPlanning
-#=======================
\ No newline at end of file
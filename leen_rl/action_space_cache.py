@@ -0,0 +1,97 @@
+from csv import reader
+from hashlib import sha1
+from io import StringIO
+from os import getpid, makedirs, replace, stat
+from os.path import basename, dirname, join
+from pickle import dump, load, HIGHEST_PROTOCOL
+from typing import Any, Dict, List, Optional
+#=======================
+#=======================
+CACHE_DIRECTORY = "__pycache__"
+CACHE_SUFFIX = ".leen_rl.pickle"
+CACHE_VERSION = 2
+BOOLEAN_VALUES = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+
+def read_action_columns(action_space_path:str, use_cache:bool = True) -> Dict[str,List[Any]]:
+    if not use_cache:
+        return parse_action_columns(_read_text(action_space_path))
+
+    cache_path = get_cache_path(action_space_path)
+    file_status = stat(action_space_path)
+    file_signature = (file_status.st_mtime_ns, file_status.st_size)
+    cached_entry = _load_cache_entry(cache_path)
+    if cached_entry and cached_entry["file_signature"] == file_signature:
+        return cached_entry["columns"]
+
+    with open(action_space_path, "rb") as action_file:
+        content = action_file.read()
+    content_hash = sha1(content).hexdigest()
+    if cached_entry and cached_entry["content_hash"] == content_hash:
+        columns = cached_entry["columns"]
+    else:
+        columns = parse_action_columns(content.decode("utf-8-sig"))
+    _write_cache_entry(
+        cache_path = cache_path,
+        entry = {
+            "version": CACHE_VERSION,
+            "file_signature": file_signature,
+            "content_hash": content_hash,
+            "columns": columns,
+        }
+    )
+    return columns
+
+def get_cache_path(action_space_path:str) -> str:
+    return join(
+        dirname(action_space_path),
+        CACHE_DIRECTORY,
+        basename(action_space_path) + CACHE_SUFFIX
+    )
+
+def parse_action_columns(content:str) -> Dict[str,List[Any]]:
+    rows = [row for row in reader(StringIO(content)) if row]
+    if not rows:
+        return {}
+    header, *records = rows
+    return {
+        name: _convert_column([record[index] if index < len(record) else "" for record in records])
+        for index, name in enumerate(header)
+    }
+
+def _convert_column(values:List[str]) -> List[Any]:
+    present_values = [value for value in values if value.strip()]
+    for converter in (int, float):
+        try:
+            converted_values = [converter(value) for value in present_values]
+        except ValueError:
+            continue
+        if len(present_values) == len(values):
+            return converted_values
+        return [float(value) if value.strip() else float("nan") for value in values]
+    if present_values and all(value.strip() in BOOLEAN_VALUES for value in present_values):
+        return [BOOLEAN_VALUES[value.strip()] if value.strip() else float("nan") for value in values]
+    return values
+
+def _read_text(path:str) -> str:
+    with open(path, encoding="utf-8-sig") as text_file:
+        return text_file.read()
+
+def _load_cache_entry(cache_path:str) -> Optional[Dict[str,Any]]:
+    try:
+        with open(cache_path, "rb") as cache_file:
+            entry = load(cache_file)
+    except Exception:
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+        return None
+    return entry
+
+def _write_cache_entry(cache_path:str, entry:Dict[str,Any]) -> None:
+    temporary_path = f"{cache_path}.{getpid()}.tmp"
+    try:
+        makedirs(dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as cache_file:
+            dump(entry, cache_file, protocol=HIGHEST_PROTOCOL)
+        replace(temporary_path, cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,246 @@
+from multiprocessing import get_context
+from os import cpu_count
+from queue import Empty, Full
+from traceback import format_exc
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from numpy import asarray, ndarray
+#=======================
+from .agent_experiment import RLExperiment
+from .object_state import find_object_state
+from .policy_approximator import MemoisedApproximator, Policy
+from .replay_buffer import ReplayBuffer, Transitions
+#=======================
+
+def get_policy_parameters(policy:Policy) -> Dict[str,ndarray]:
+    return {
+        key: value for key, _, _, value in find_object_state(owner=policy, path="policy")
+        if isinstance(value, ndarray)
+    }
+
+def set_policy_parameters(policy:Policy, parameters:Dict[str,ndarray]) -> None:
+    for key, owner, name, value in find_object_state(owner=policy, path="policy"):
+        if key not in parameters:
+            continue
+        if isinstance(value, ndarray) and value.shape == parameters[key].shape:
+            value[...] = parameters[key]
+        else:
+            setattr(owner, name, parameters[key])
+    if isinstance(policy, MemoisedApproximator):
+        policy.clear_cache()
+
+class ActorExit(NamedTuple):
+    actor_id:int
+    error:Optional[str] = None
+
+class TransitionStreamer:
+    def __init__(self, transition_queue:Any, batch_size:int = 32) -> None:
+        self.transition_queue = transition_queue
+        self.batch_size = batch_size
+        self.number_of_sent_transitions = 0
+        self._clear_batch()
+
+    def _clear_batch(self) -> None:
+        self.belief_features:List[ndarray] = []
+        self.action_indices:List[int] = []
+        self.rewards:List[float] = []
+        self.next_belief_features:List[ndarray] = []
+        self.dones:List[bool] = []
+
+    def __len__(self) -> int:
+        return len(self.action_indices)
+
+    def add(
+        self,
+        belief_features:ndarray,
+        action_index:int,
+        reward:float,
+        next_belief_features:ndarray,
+        done:bool = False,
+    ) -> None:
+        self.belief_features.append(belief_features)
+        self.action_indices.append(action_index)
+        self.rewards.append(reward)
+        self.next_belief_features.append(next_belief_features)
+        self.dones.append(done)
+        if len(self) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not len(self):
+            return
+        self.transition_queue.put(
+            (
+                asarray(self.belief_features),
+                asarray(self.action_indices),
+                asarray(self.rewards),
+                asarray(self.next_belief_features),
+                asarray(self.dones),
+            )
+        )
+        self.number_of_sent_transitions += len(self)
+        self._clear_batch()
+
+def _apply_latest_parameters(policy:Policy, parameter_queue:Any) -> bool:
+    parameters = None
+    while True:
+        try:
+            parameters = parameter_queue.get_nowait()
+        except Empty:
+            break
+    if parameters is None:
+        return False
+    set_policy_parameters(policy=policy, parameters=parameters)
+    return True
+
+def _run_actor(
+    actor_id:int,
+    experiment_factory:Callable[[int], RLExperiment],
+    number_of_steps:int,
+    transition_queue:Any,
+    parameter_queue:Any,
+    send_every:int,
+) -> None:
+    try:
+        experiment = experiment_factory(actor_id)
+        experiment.verbose = False
+        experiment.replay_buffer = TransitionStreamer(
+            transition_queue = transition_queue,
+            batch_size = send_every,
+        )
+        for _ in range(number_of_steps):
+            _apply_latest_parameters(policy=experiment.agent.policy, parameter_queue=parameter_queue)
+            experiment._step()
+        experiment.replay_buffer.flush()
+    except BaseException:
+        transition_queue.put(ActorExit(actor_id=actor_id, error=format_exc()))
+        raise
+    transition_queue.put(ActorExit(actor_id=actor_id))
+
+def learn_from_transitions(policy:Policy, transitions:Transitions) -> Any:
+    return policy.learn_from_transitions(transitions)
+
+def _raise_for_dead_actors(actors:List[Any], actor_ids:Iterable[int]) -> None:
+    dead_actors = {
+        actor_id: actors[actor_id].exitcode for actor_id in actor_ids
+        if actors[actor_id].exitcode not in (None, 0)
+    }
+    if dead_actors:
+        raise RuntimeError(f"actors exited with non-zero exit codes (actor id: exit code) {dead_actors}")
+
+class ActorLearner:
+    def __init__(
+        self,
+        experiment_factory:Callable[[int], RLExperiment],
+        learner_policy:Policy,
+        replay_buffer:ReplayBuffer,
+        number_of_actors:Optional[int] = None,
+        batch_size:int = 64,
+        send_every:int = 32,
+        broadcast_every:int = 10,
+        max_queued_batches:int = 256,
+        learn:Callable[[Policy, Transitions], Any] = learn_from_transitions,
+        start_method:Optional[str] = None,
+        poll_interval:float = 1.,
+    ) -> None:
+        self.experiment_factory = experiment_factory
+        self.learner_policy = learner_policy
+        self.replay_buffer = replay_buffer
+        self.number_of_actors = number_of_actors if number_of_actors else max((cpu_count() or 2) - 1, 1)
+        self.batch_size = batch_size
+        self.send_every = send_every
+        self.broadcast_every = broadcast_every
+        self.max_queued_batches = max_queued_batches
+        self.learn = learn
+        self.context = get_context(start_method)
+        self.poll_interval = poll_interval
+        self.number_of_updates = 0
+        self.number_of_broadcasts = 0
+        self.number_of_received_transitions = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{__class__.__name__}(actors={self.number_of_actors}, transitions={self.number_of_received_transitions}, "
+            f"updates={self.number_of_updates}, broadcasts={self.number_of_broadcasts})"
+        )
+
+    def run(self, number_of_steps_per_actor:int = 1000) -> None:
+        transition_queue = self.context.Queue(maxsize=self.max_queued_batches)
+        parameter_queues = [self.context.Queue(maxsize=1) for _ in range(self.number_of_actors)]
+        self._broadcast_parameters(parameter_queues)
+        actors = [
+            self.context.Process(
+                target = _run_actor,
+                args = (
+                    actor_id,
+                    self.experiment_factory,
+                    number_of_steps_per_actor,
+                    transition_queue,
+                    parameter_queue,
+                    self.send_every,
+                ),
+                daemon = True,
+            ) for actor_id, parameter_queue in enumerate(parameter_queues)
+        ]
+        for actor in actors:
+            actor.start()
+        try:
+            self._learn_until_actors_finish(
+                actors = actors,
+                transition_queue = transition_queue,
+                parameter_queues = parameter_queues,
+            )
+        except BaseException:
+            for actor in actors:
+                actor.terminate()
+            transition_queue.cancel_join_thread()
+            raise
+        finally:
+            for actor in actors:
+                actor.join()
+            transition_queue.close()
+            for parameter_queue in parameter_queues:
+                parameter_queue.cancel_join_thread()
+                parameter_queue.close()
+        _raise_for_dead_actors(actors=actors, actor_ids=range(len(actors)))
+
+    def _learn_until_actors_finish(self, actors:List[Any], transition_queue:Any, parameter_queues:List[Any]) -> None:
+        running_actor_ids = set(range(len(actors)))
+        while running_actor_ids:
+            _raise_for_dead_actors(actors=actors, actor_ids=running_actor_ids)
+            try:
+                batch = transition_queue.get(timeout=self.poll_interval)
+            except Empty:
+                continue
+            if isinstance(batch, ActorExit):
+                if batch.error is not None:
+                    raise RuntimeError(f"actor {batch.actor_id} failed:\n{batch.error}")
+                running_actor_ids.discard(batch.actor_id)
+                continue
+            belief_features, action_indices, rewards, next_belief_features, dones = batch
+            self.replay_buffer.add_batch(
+                belief_features = belief_features,
+                action_indices = action_indices,
+                rewards = rewards,
+                next_belief_features = next_belief_features,
+                dones = dones,
+            )
+            self.number_of_received_transitions += len(action_indices)
+            if len(self.replay_buffer) < self.batch_size:
+                continue
+            self.learn(self.learner_policy, self.replay_buffer.sample(self.batch_size))
+            self.number_of_updates += 1
+            if not self.number_of_updates % self.broadcast_every:
+                self._broadcast_parameters(parameter_queues)
+
+    def _broadcast_parameters(self, parameter_queues:List[Any]) -> None:
+        parameters = get_policy_parameters(self.learner_policy)
+        for parameter_queue in parameter_queues:
+            try:
+                parameter_queue.get_nowait()
+            except Empty:
+                pass
+            try:
+                parameter_queue.put_nowait(parameters)
+            except Full:
+                continue
+        self.number_of_broadcasts += 1
@@ -1,8 +1,14 @@
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter, sleep
+from typing import Optional, List, Union
 #=======================
 from .policy_approximator import Policy
 from .environment_sensor_map import Environment, Sensor, CognitiveMap
 from .state_action import Action, Observation, BeliefState
+from .replay_buffer import ReplayBuffer
+from .step_profiler import StepProfiler
+from .background_renderer import BackgroundRenderer, EVERY_STEP, SUMMARY, verbosity_level
+from .checkpoint import ExperimentCheckpoint
 #=======================
 
 class Agent:
@@ -13,11 +19,14 @@ class Agent:
         cognitive_map: CognitiveMap,
         belief_state:Optional[BeliefState] = None,
         observation:Optional[Observation] = None,
+        profiler:Optional[StepProfiler] = None,
     ) -> None:
         self.sensor = sensor
         self.policy = policy 
         self.cognitive_map = cognitive_map
         self.belief_state = belief_state
+        self.belief_states = None
+        self.profiler = profiler
         
     def select_action(
         self, 
@@ -25,57 +34,383 @@ class Agent:
         last_action:Action,
     ) -> Action:
 
+        if self.profiler is not None:
+            return self._select_action_with_profiler(
+                state = state,
+                last_action = last_action,
+            )
+
+        return self.decide(
+            observation = self.observe(state),
+            last_action = last_action,
+        )
+
+    def observe(self, state:Environment) -> Observation:
         self.observation = self.sensor.get_observation(state)
+        return self.observation
+
+    def decide(
+        self, 
+        observation:Observation,
+        last_action:Optional[Action],
+    ) -> Action:
 
         self.belief_state = self.cognitive_map.get_belief_state(
             previous_action = last_action,
             previous_belief_state = self.belief_state,
-            observation = self.observation,
+            observation = observation,
         )
 
         return self.policy.get_action(
             belief_state = self.belief_state 
         )
 
+    def _select_action_with_profiler(
+        self, 
+        state:Environment,
+        last_action:Action,
+    ) -> Action:
+
+        start_time = perf_counter()
+        self.observation = self.sensor.get_observation(state)
+        observation_time = perf_counter()
+
+        self.belief_state = self.cognitive_map.get_belief_state(
+            previous_action = last_action,
+            previous_belief_state = self.belief_state,
+            observation = self.observation,
+        )
+        belief_state_time = perf_counter()
+
+        action = self.policy.get_action(
+            belief_state = self.belief_state 
+        )
+        action_time = perf_counter()
+
+        self.profiler.record(phase="get_observation", duration=observation_time-start_time)
+        self.profiler.record(phase="get_belief_state", duration=belief_state_time-observation_time)
+        self.profiler.record(phase="get_action", duration=action_time-belief_state_time)
+        return action
+
+    def select_actions(
+        self, 
+        states:List[Environment],
+        last_actions:List[Optional[Action]],
+    ) -> List[Action]:
+
+        self.observations = self.sensor.get_observations(states)
+
+        self.belief_states = self.cognitive_map.get_belief_states(
+            previous_actions = last_actions,
+            previous_belief_states = self.belief_states or [None]*len(states),
+            observations = self.observations,
+        )
+
+        return self.policy.get_actions(
+            belief_states = self.belief_states
+        )
+
 class RLExperiment:
     def __init__(
         self, 
         environment:Environment, 
         agent:Agent, 
         action:Optional[Action] = None, 
-        verbose:bool=True
+        verbose:Union[bool,int]=True,
+        control_period:Optional[float] = None,
+        replay_buffer:Optional[ReplayBuffer] = None,
+        profiler:Optional[StepProfiler] = None,
+        render_every:int = 1,
+        render_period:Optional[float] = None,
+        renderer:Optional[BackgroundRenderer] = None,
+        checkpoint:Optional[ExperimentCheckpoint] = None,
     ) -> None:
 
         self.agent = agent 
         self.environment = environment
         self.verbose = verbose
+        self.render_every = render_every
+        self.render_period = render_period
+        self.renderer = renderer
+        self.number_of_steps_taken = 0
+        self._next_render_time = 0.
         self.action = action
+        self.control_period = control_period
+        self.overruns = 0
+        self.longest_overrun = 0.
+        self.replay_buffer = replay_buffer
+        self._pending_transition = None
+        self.profiler = profiler
+        if profiler is not None:
+            self.agent.profiler = profiler
+        self.checkpoint = checkpoint
+        if checkpoint is not None:
+            checkpoint.restore(self)
     
+    @property
+    def verbose(self) -> Union[bool,int]:
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, verbose:Union[bool,int]) -> None:
+        self._verbose = verbose
+        self.verbosity = verbosity_level(verbose)
+
     def run(self, number_of_steps:int = 100) -> None:
+        if self.profiler is not None:
+            self.profiler.start()
         self._iterate(number_of_steps)
+        if self.profiler is not None:
+            self.profiler.stop()
+        if self.checkpoint is not None:
+            self.checkpoint.save(self)
+        if self.renderer is not None:
+            self.renderer.flush()
 
-        if self.verbose: 
+        if self.verbosity >= SUMMARY: 
             print(f"n iterations = {number_of_steps}")
+            if self.control_period is not None:
+                print(f"overruns = {self.overruns} (longest = {self.longest_overrun:.6f}s)")
+            if self.renderer is not None and self.renderer.dropped_frames:
+                print(f"dropped frames = {self.renderer.dropped_frames}")
+            if self.renderer is not None and self.renderer.failed_frames:
+                print(f"failed frames = {self.renderer.failed_frames}")
+            if self.profiler is not None:
+                print(self.profiler)
             print(self.agent.policy)
             self.plot_results()
 
     def _step(self) -> None:
+        step_start_time = perf_counter() if self.profiler is not None else None
         self.action = self.agent.select_action(
             state = self.environment,
             last_action = self.action,
         )
+        if self.replay_buffer is not None:
+            self._remember_transition()
+        self._update_environment()
+        if self.replay_buffer is not None:
+            self._remember_outcome()
+        self.number_of_steps_taken += 1
+        if self.checkpoint is not None and not self.number_of_steps_taken % self.checkpoint.checkpoint_every:
+            self.checkpoint.save(self)
+        if self.verbosity >= EVERY_STEP and self._should_render():
+            self._render(
+                self.agent.observation,
+                self.agent.belief_state,
+                self.action,
+            )
+        if step_start_time is not None:
+            self.profiler.record(phase="step", duration=perf_counter()-step_start_time)
+
+    def _render(self, *items:object) -> None:
+        if self.renderer is None:
+            self.renderer = BackgroundRenderer()
+        self.renderer.submit(*items)
+
+    def _should_render(self) -> bool:
+        if self.number_of_steps_taken % self.render_every:
+            return False
+        if self.render_period is not None:
+            current_time = perf_counter()
+            if current_time < self._next_render_time:
+                return False
+            self._next_render_time = current_time + self.render_period
+        return True
+
+    def _update_environment(self) -> None:
+        if self.profiler is None:
+            self.environment.update_state(self.action)
+            return
+        update_start_time = perf_counter()
         self.environment.update_state(self.action)
-        if self.verbose:
-            print(self.agent.observation)
-            print(self.agent.belief_state)
-            print(self.action)
-            print("-"*15)
+        self.profiler.record(phase="update_state", duration=perf_counter()-update_start_time)
     
+    def _remember_transition(self) -> None:
+        self._belief_features = self.agent.cognitive_map.encode_belief_state(
+            self.agent.belief_state
+        )
+        if self._pending_transition is not None:
+            belief_features, action_index, reward, done = self._pending_transition
+            self.replay_buffer.add(
+                belief_features = belief_features,
+                action_index = action_index,
+                reward = reward,
+                next_belief_features = self._belief_features,
+                done = done,
+            )
+
+    def _remember_outcome(self) -> None:
+        self._pending_transition = (
+            self._belief_features,
+            self.agent.policy.action_space.index_of(self.action),
+            self.environment.get_reward(),
+            self.environment.is_terminal(),
+        )
+
     def _iterate(self, number_of_steps:int) -> None:
+        if self.control_period is None:
+            for _ in range(number_of_steps):
+                self._step()
+            return
+        self._iterate_at_fixed_rate(number_of_steps)
+
+    def _iterate_at_fixed_rate(self, number_of_steps:int) -> None:
+        next_tick = perf_counter()
         for _ in range(number_of_steps):
             self._step()
+            next_tick += self.control_period
+            remaining_time = next_tick - perf_counter()
+            if remaining_time >= 0:
+                sleep(remaining_time)
+            else:
+                self.overruns += 1
+                self.longest_overrun = max(self.longest_overrun, -remaining_time)
+                next_tick = perf_counter()
 
     def plot_results(self) -> None:
         pass 
-        #TODO 
-    
+        #TODO
+
+class VectorisedRLExperiment(RLExperiment):
+    def __init__(
+        self, 
+        environments:List[Environment], 
+        agent:Agent, 
+        actions:Optional[List[Action]] = None, 
+        verbose:Union[bool,int]=True,
+        control_period:Optional[float] = None,
+        render_every:int = 1,
+        render_period:Optional[float] = None,
+        renderer:Optional[BackgroundRenderer] = None,
+    ) -> None:
+
+        super().__init__(
+            environment = None,
+            agent = agent,
+            verbose = verbose,
+            control_period = control_period,
+            render_every = render_every,
+            render_period = render_period,
+            renderer = renderer,
+        )
+        self.environments = environments
+        self.actions = actions if actions else [None]*len(environments)
+
+    def _step(self) -> None:
+        self.actions = self.agent.select_actions(
+            states = self.environments,
+            last_actions = self.actions,
+        )
+        for environment, action in zip(self.environments, self.actions):
+            environment.update_state(action)
+        self.number_of_steps_taken += 1
+        if self.verbosity >= EVERY_STEP and self._should_render():
+            self._render(
+                *(
+                    item for items in zip(
+                        self.agent.observations,
+                        self.agent.belief_states,
+                        self.actions
+                    ) for item in items
+                )
+            )
+
+class PipelinedRLExperiment(RLExperiment):
+    def __init__(
+        self, 
+        environment:Environment, 
+        agent:Agent, 
+        action:Optional[Action] = None, 
+        verbose:Union[bool,int]=True,
+        control_period:Optional[float] = None,
+        action_latency:int = 1,
+        render_every:int = 1,
+        render_period:Optional[float] = None,
+        renderer:Optional[BackgroundRenderer] = None,
+    ) -> None:
+
+        if action_latency not in (0, 1):
+            raise ValueError(f"action_latency must be 0 or 1, not {action_latency}")
+        super().__init__(
+            environment = environment,
+            agent = agent,
+            action = action,
+            verbose = verbose,
+            control_period = control_period,
+            render_every = render_every,
+            render_period = render_period,
+            renderer = renderer,
+        )
+        self.action_latency = action_latency
+        self.applied_action = None
+        self._pending_action = action if action_latency else None
+        self._environment_worker = None
+
+    def __enter__(self) -> "PipelinedRLExperiment":
+        return self
+
+    def __exit__(self, *exception_information:object) -> None:
+        self.close()
+
+    def run(self, number_of_steps:int = 100) -> None:
+        try:
+            super().run(number_of_steps)
+        finally:
+            self.close()
+
+    def _iterate(self, number_of_steps:int) -> None:
+        super()._iterate(number_of_steps)
+        self._apply_pending_action()
+
+    def _apply_pending_action(self) -> None:
+        if self._pending_action is None:
+            return
+        self._update_environment_in_worker(self._pending_action).result()
+        self.applied_action = self._pending_action
+        self._pending_action = None
+
+    def _update_environment_in_worker(self, action:Action) -> Future:
+        if self._environment_worker is None:
+            self._environment_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="environment")
+        return self._environment_worker.submit(self.environment.update_state, action)
+
+    def _step(self) -> None:
+        if self.action_latency:
+            self._step_with_latency()
+        else:
+            observation = self.agent.observe(self.environment)
+            self.applied_action = self.action
+            self.action = self.agent.decide(
+                observation = observation,
+                last_action = self.applied_action,
+            )
+            self._update_environment_in_worker(self.action).result()
+        self.number_of_steps_taken += 1
+        if self.verbosity >= EVERY_STEP and self._should_render():
+            self._render(
+                self.agent.observation,
+                self.agent.belief_state,
+                self.action,
+            )
+
+    def _step_with_latency(self) -> None:
+        observation = self.agent.observe(self.environment)
+        pending_action = self._pending_action
+        environment_update = None if pending_action is None else self._update_environment_in_worker(pending_action)
+        try:
+            self.action = self.agent.decide(
+                observation = observation,
+                last_action = self.applied_action,
+            )
+        finally:
+            if environment_update is not None:
+                environment_update.result()
+        if pending_action is not None:
+            self.applied_action = pending_action
+        self._pending_action = self.action
+
+    def close(self) -> None:
+        if self._environment_worker is not None:
+            self._environment_worker.shutdown()
+            self._environment_worker = None
@@ -0,0 +1,148 @@
+from asyncio import gather, to_thread
+from typing import Any, List, Optional, Union
+#=======================
+from .agent_experiment import Agent
+from .environment_sensor_map import Environment, Sensor, CognitiveMap
+from .policy_approximator import Policy
+from .state_action import Action, BeliefState, Observation
+#=======================
+
+class AsyncEnvironment(Environment):
+    async def update_state(self, action:Action) -> None:
+        raise NotImplementedError
+
+class AsyncSensor(Sensor):
+    async def get_observation(self, state:Environment) -> Observation:
+        raise NotImplementedError
+
+class AsyncPolicy(Policy):
+    async def get_action(self, belief_state:BeliefState) -> Action:
+        raise NotImplementedError
+
+class ThreadOffloadedEnvironment(AsyncEnvironment):
+    def __init__(self, environment:Environment) -> None:
+        self.environment = environment
+
+    def __getattr__(self, name:str) -> Any:
+        if name == "environment":
+            raise AttributeError(name)
+        return getattr(self.environment, name)
+
+    def initialise_state(self) -> None:
+        self.environment.initialise_state()
+
+    async def update_state(self, action:Action) -> None:
+        await to_thread(self.environment.update_state, action)
+
+class ThreadOffloadedSensor(AsyncSensor):
+    def __init__(self, sensor:Sensor) -> None:
+        self.sensor = sensor
+
+    async def get_observation(self, state:Environment) -> Observation:
+        return await to_thread(self.sensor.get_observation, state)
+
+class ThreadOffloadedPolicy(AsyncPolicy):
+    def __init__(self, policy:Policy) -> None:
+        self.policy = policy
+        self.action_space = policy.action_space
+
+    def __str__(self) -> str:
+        return str(self.policy)
+
+    async def get_action(self, belief_state:BeliefState) -> Action:
+        return await to_thread(self.policy.get_action, belief_state)
+
+def as_async_environment(environment:Environment) -> AsyncEnvironment:
+    return environment if isinstance(environment, AsyncEnvironment) else ThreadOffloadedEnvironment(environment)
+
+def as_async_sensor(sensor:Sensor) -> AsyncSensor:
+    return sensor if isinstance(sensor, AsyncSensor) else ThreadOffloadedSensor(sensor)
+
+def as_async_policy(policy:Policy) -> AsyncPolicy:
+    return policy if isinstance(policy, AsyncPolicy) else ThreadOffloadedPolicy(policy)
+
+class AsyncAgent:
+    def __init__(
+        self,
+        sensor:Union[Sensor,AsyncSensor],
+        policy:Union[Policy,AsyncPolicy],
+        cognitive_map:CognitiveMap,
+        belief_state:Optional[BeliefState] = None,
+    ) -> None:
+        self.sensor = as_async_sensor(sensor)
+        self.policy = as_async_policy(policy)
+        self.cognitive_map = cognitive_map
+        self.belief_state = belief_state
+        self.observation = None
+
+    @classmethod
+    def from_agent(cls, agent:Agent) -> "AsyncAgent":
+        return cls(
+            sensor = agent.sensor,
+            policy = agent.policy,
+            cognitive_map = agent.cognitive_map,
+            belief_state = agent.belief_state,
+        )
+
+    async def select_action(
+        self,
+        state:AsyncEnvironment,
+        last_action:Optional[Action],
+    ) -> Action:
+
+        self.observation = await self.sensor.get_observation(state)
+
+        self.belief_state = self.cognitive_map.get_belief_state(
+            previous_action = last_action,
+            previous_belief_state = self.belief_state,
+            observation = self.observation,
+        )
+
+        return await self.policy.get_action(
+            belief_state = self.belief_state
+        )
+
+class AsyncRLExperiment:
+    def __init__(
+        self,
+        environment:Union[Environment,AsyncEnvironment],
+        agent:Union[Agent,AsyncAgent],
+        action:Optional[Action] = None,
+        verbose:bool=True
+    ) -> None:
+
+        self.agent = agent if isinstance(agent, AsyncAgent) else AsyncAgent.from_agent(agent)
+        self.environment = as_async_environment(environment)
+        self.verbose = verbose
+        self.action = action
+
+    async def run(self, number_of_steps:int = 100) -> None:
+        await self._iterate(number_of_steps)
+
+        if self.verbose:
+            print(f"n iterations = {number_of_steps}")
+            print(self.agent.policy)
+
+    async def _step(self) -> None:
+        self.action = await self.agent.select_action(
+            state = self.environment,
+            last_action = self.action,
+        )
+        await self.environment.update_state(self.action)
+        if self.verbose:
+            print(self.agent.observation)
+            print(self.agent.belief_state)
+            print(self.action)
+            print("-"*15)
+
+    async def _iterate(self, number_of_steps:int) -> None:
+        for _ in range(number_of_steps):
+            await self._step()
+
+async def run_experiments_concurrently(
+    experiments:List[AsyncRLExperiment],
+    number_of_steps:int = 100,
+) -> None:
+    await gather(
+        *(experiment.run(number_of_steps) for experiment in experiments)
+    )
@@ -0,0 +1,107 @@
+from queue import Full, Queue
+from sys import stderr, stdout
+from threading import Thread
+from traceback import print_exception
+from typing import Any, Optional, TextIO, Union
+from numpy import array, ndarray
+#=======================
+from .state_action import Action, ActionView, BeliefState, Observation, StructuredState
+#=======================
+SILENT = 0
+SUMMARY = 1
+EVERY_STEP = 2
+
+IMMUTABLE_TYPES = (bool, int, float, complex, str, bytes, type(None))
+
+def verbosity_level(verbose:Union[bool,int,None]) -> int:
+    if verbose is True:
+        return EVERY_STEP
+    return int(verbose or SILENT)
+
+def _snapshot_value(value:Any) -> Any:
+    if isinstance(value, ndarray):
+        return value.copy()
+    if isinstance(value, IMMUTABLE_TYPES + (ActionView,)):
+        return value
+    if isinstance(value, StructuredState):
+        return value.evolve(**{name: _snapshot_value(item) for name, item in value.as_dict().items()})
+    if isinstance(value, (BeliefState, Observation, Action)):
+        return value.evolve(**{name: _snapshot_value(item) for name, item in value.__dict__.items()})
+    if hasattr(value, "__array__"):
+        return array(value)
+    if type(value) in (list, tuple):
+        return type(value)(_snapshot_value(item) for item in value)
+    if type(value) is dict:
+        return {key: _snapshot_value(item) for key, item in value.items()}
+    return str(value)
+
+class BackgroundRenderer:
+    def __init__(
+        self,
+        max_queue_size:int = 256,
+        output:Optional[TextIO] = None,
+        separator:str = "-"*15,
+    ) -> None:
+        self.output = output
+        self.separator = separator
+        self.frames:Queue = Queue(maxsize=max_queue_size)
+        self.rendered_frames = 0
+        self.dropped_frames = 0
+        self.failed_frames = 0
+        self._thread:Optional[Thread] = None
+
+    def __str__(self) -> str:
+        return (
+            f"{__class__.__name__}(rendered={self.rendered_frames}, dropped={self.dropped_frames}, "
+            f"failed={self.failed_frames})"
+        )
+
+    def submit(self, *items:Any) -> bool:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = Thread(target=self._render_forever, name=__class__.__name__, daemon=True)
+            self._thread.start()
+        if self.frames.full():
+            self.dropped_frames += 1
+            return False
+        try:
+            self.frames.put_nowait(tuple(map(_snapshot_value, items)))
+        except Full:
+            self.dropped_frames += 1
+            return False
+        return True
+
+    def flush(self, poll_interval:float = .1) -> None:
+        if self._thread is None:
+            return
+        with self.frames.all_tasks_done:
+            while self.frames.unfinished_tasks and self._thread.is_alive():
+                self.frames.all_tasks_done.wait(timeout=poll_interval)
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self.flush()
+        if self._thread.is_alive():
+            self.frames.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def _render_forever(self) -> None:
+        while True:
+            items = self.frames.get()
+            try:
+                if items is None:
+                    return
+                self.render(*items)
+                self.rendered_frames += 1
+            except Exception as exception:
+                self.failed_frames += 1
+                if self.failed_frames == 1:
+                    print_exception(exception, file=stderr)
+            finally:
+                self.frames.task_done()
+
+    def render(self, *items:Any) -> None:
+        output = self.output or stdout
+        output.write("\n".join([*map(str, items), self.separator, ""]))
+
@@ -0,0 +1,216 @@
+from os import getpid, makedirs, replace
+from os.path import exists, join
+from pickle import dump, load, HIGHEST_PROTOCOL
+from random import getstate, setstate
+from typing import Any, Dict, Iterator, Optional, Tuple
+from numpy import array_equal, memmap, ndarray, uint8
+from numpy.lib.format import open_memmap
+from numpy.random import Generator
+#=======================
+from .object_state import find_object_state
+#=======================
+SIDECAR_NAME = "checkpoint.pickle"
+CHECKPOINT_VERSION = 3
+CHECKPOINT_SLOTS = ("a", "b")
+BLOCK_SIZE = 1 << 16
+LEARNT_SCALARS = ("position", "size", "max_priority", "number_of_updates", "number_of_insertions", "planning_step")
+
+def _other_slot(slot:Optional[str]) -> str:
+    return CHECKPOINT_SLOTS[0] if slot == CHECKPOINT_SLOTS[1] else CHECKPOINT_SLOTS[1]
+
+def _copy_changed_blocks(source:ndarray, destination:ndarray, block_size:int = BLOCK_SIZE) -> int:
+    if not (source.flags.c_contiguous and destination.flags.c_contiguous):
+        destination[...] = source
+        return source.nbytes
+    source_bytes = source.reshape(-1).view(uint8)
+    destination_bytes = destination.reshape(-1).view(uint8)
+    copied_bytes = 0
+    for start in range(0, len(source_bytes), block_size):
+        source_block = source_bytes[start:start + block_size]
+        destination_block = destination_bytes[start:start + block_size]
+        if not array_equal(source_block, destination_block):
+            destination_block[...] = source_block
+            copied_bytes += len(source_block)
+    return copied_bytes
+
+def _copy_new_rows(source:ndarray, destination:ndarray, position:int, number_of_new_rows:int) -> int:
+    capacity = len(source)
+    if number_of_new_rows >= capacity:
+        destination[...] = source
+        return source.nbytes
+    start = (position - number_of_new_rows) % capacity
+    if start + number_of_new_rows <= capacity:
+        destination[start:start + number_of_new_rows] = source[start:start + number_of_new_rows]
+    else:
+        destination[start:] = source[start:]
+        destination[:position] = source[:position]
+    return number_of_new_rows * (source.nbytes // capacity)
+
+class ExperimentCheckpoint:
+    def __init__(
+        self,
+        directory:str,
+        checkpoint_every:int = 1000,
+        components:Tuple[str,...] = ("agent.policy", "agent.cognitive_map", "replay_buffer"),
+        learnt_scalars:Tuple[str,...] = LEARNT_SCALARS,
+    ) -> None:
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.components = components
+        self.learnt_scalars = learnt_scalars
+        self.mapped_arrays:Dict[str,memmap] = {}
+        self.committed_slot:Optional[str] = None
+        self.slot_insertions:Dict[str,Dict[str,int]] = {}
+        self.number_of_checkpoints = 0
+        self.written_bytes = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{__class__.__name__}({self.directory!r}, slot={self.committed_slot}, "
+            f"checkpoints={self.number_of_checkpoints}, written_bytes={self.written_bytes})"
+        )
+
+    @property
+    def sidecar_path(self) -> str:
+        return join(self.directory, SIDECAR_NAME)
+
+    def _array_path(self, key:str, slot:str) -> str:
+        return join(self.directory, f"{key}.{slot}.npy")
+
+    def _find_experiment_state(self, experiment:Any) -> Iterator[Tuple[str,Any,str,Any]]:
+        visited = set()
+        for component_path in self.components:
+            component = experiment
+            for name in component_path.split("."):
+                component = getattr(component, name, None)
+            if component is not None:
+                yield from find_object_state(owner=component, path=component_path, visited=visited)
+
+    def _map_slot_array(self, key:str, slot:str, array:ndarray) -> Tuple[memmap,bool]:
+        path = self._array_path(key=key, slot=slot)
+        mapped_array = self.mapped_arrays.get(path)
+        if mapped_array is None and exists(path):
+            mapped_array = open_memmap(path, mode="r+")
+        if mapped_array is not None and mapped_array.shape == array.shape and mapped_array.dtype == array.dtype:
+            self.mapped_arrays[path] = mapped_array
+            return mapped_array, False
+        mapped_array = self.mapped_arrays[path] = open_memmap(path, mode="w+", shape=array.shape, dtype=array.dtype)
+        return mapped_array, True
+
+    def _write_array(
+        self,
+        key:str,
+        owner:Any,
+        name:str,
+        array:ndarray,
+        slot:str,
+        last_insertions:Dict[str,int],
+    ) -> int:
+        mapped_array, is_new = self._map_slot_array(key=key, slot=slot, array=array)
+        owner_path = key.rsplit(".", 1)[0]
+        if is_new:
+            mapped_array[...] = array
+            written_bytes = array.nbytes
+        elif name in getattr(owner, "row_arrays", ()) and owner_path in last_insertions:
+            written_bytes = _copy_new_rows(
+                source = array,
+                destination = mapped_array,
+                position = owner.position,
+                number_of_new_rows = owner.number_of_insertions - last_insertions[owner_path],
+            )
+        else:
+            written_bytes = _copy_changed_blocks(source=array, destination=mapped_array)
+        mapped_array.flush()
+        return written_bytes
+
+    def save(self, experiment:Any) -> None:
+        makedirs(self.directory, exist_ok=True)
+        slot = _other_slot(self.committed_slot)
+        last_insertions = self.slot_insertions.get(slot, {})
+        insertions = {}
+        small_state = {}
+        for key, owner, name, value in self._find_experiment_state(experiment):
+            if isinstance(value, ndarray):
+                self.written_bytes += self._write_array(
+                    key = key,
+                    owner = owner,
+                    name = name,
+                    array = value,
+                    slot = slot,
+                    last_insertions = last_insertions,
+                )
+                if name in getattr(owner, "row_arrays", ()):
+                    insertions[key.rsplit(".", 1)[0]] = owner.number_of_insertions
+            elif isinstance(value, Generator):
+                small_state[key] = value.bit_generator.state
+            elif name in self.learnt_scalars:
+                small_state[key] = value
+        slot_insertions = {**self.slot_insertions, slot: insertions}
+        action = experiment.action
+        self._write_sidecar(
+            {
+                "version": CHECKPOINT_VERSION,
+                "slot": slot,
+                "slot_insertions": slot_insertions,
+                "number_of_steps_taken": experiment.number_of_steps_taken,
+                "belief_state": experiment.agent.belief_state,
+                "action_index": None if action is None else experiment.agent.policy.action_space.index_of(action),
+                "pending_transition": getattr(experiment, "_pending_transition", None),
+                "small_state": small_state,
+                "random_state": getstate(),
+            }
+        )
+        self.committed_slot = slot
+        self.slot_insertions = slot_insertions
+        self.number_of_checkpoints += 1
+
+    def restore(self, experiment:Any) -> bool:
+        sidecar = self._load_sidecar()
+        if sidecar is None:
+            return False
+        slot = sidecar["slot"]
+        small_state = sidecar["small_state"]
+        for key, owner, name, value in self._find_experiment_state(experiment):
+            if isinstance(value, ndarray):
+                path = self._array_path(key=key, slot=slot)
+                if not exists(path):
+                    continue
+                checkpointed_array = open_memmap(path, mode="c")
+                if checkpointed_array.shape != value.shape or checkpointed_array.dtype != value.dtype:
+                    raise ValueError(
+                        f"checkpointed {key} has shape {checkpointed_array.shape} and dtype {checkpointed_array.dtype}, "
+                        f"expected {value.shape} and {value.dtype}"
+                    )
+                setattr(owner, name, checkpointed_array)
+            elif key not in small_state:
+                continue
+            elif isinstance(value, Generator):
+                value.bit_generator.state = small_state[key]
+            else:
+                setattr(owner, name, small_state[key])
+        setstate(sidecar["random_state"])
+        experiment.number_of_steps_taken = sidecar["number_of_steps_taken"]
+        experiment.agent.belief_state = sidecar["belief_state"]
+        action_index = sidecar["action_index"]
+        experiment.action = None if action_index is None else experiment.agent.policy.action_space[action_index]
+        if hasattr(experiment, "_pending_transition"):
+            experiment._pending_transition = sidecar["pending_transition"]
+        self.committed_slot = slot
+        self.slot_insertions = {slot: sidecar["slot_insertions"].get(slot, {})}
+        return True
+
+    def _load_sidecar(self) -> Optional[Dict[str,Any]]:
+        try:
+            with open(self.sidecar_path, "rb") as sidecar_file:
+                sidecar = load(sidecar_file)
+        except FileNotFoundError:
+            return None
+        if sidecar.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version {sidecar.get('version')} in {self.sidecar_path}")
+        return sidecar
+
+    def _write_sidecar(self, sidecar:Dict[str,Any]) -> None:
+        temporary_path = f"{self.sidecar_path}.{getpid()}.tmp"
+        with open(temporary_path, "wb") as sidecar_file:
+            dump(sidecar, sidecar_file, protocol=HIGHEST_PROTOCOL)
+        replace(temporary_path, self.sidecar_path)
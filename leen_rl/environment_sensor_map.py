@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Optional, List
+from numpy import ndarray
 #=======================
 from .state_action import BeliefState, Observation, Action
 #=======================
@@ -13,10 +14,19 @@ class Environment:
     def update_state(self, action:Action) -> None:
         raise NotImplementedError
 
+    def get_reward(self) -> float:
+        raise NotImplementedError
+
+    def is_terminal(self) -> bool:
+        return False
+
 class Sensor:
     def get_observation(self, state:Environment) -> Observation:
         raise NotImplementedError
 
+    def get_observations(self, states:List[Environment]) -> List[Observation]:
+        return [self.get_observation(state) for state in states]
+
 class CognitiveMap:    
     def get_belief_state(
         self, 
@@ -24,4 +34,25 @@ class CognitiveMap:
         previous_belief_state:Optional[BeliefState] = None,
         previous_action:Optional[Action] = None
     ) -> BeliefState:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def get_belief_states(
+        self, 
+        observations:List[Observation],
+        previous_belief_states:List[Optional[BeliefState]],
+        previous_actions:List[Optional[Action]],
+    ) -> List[BeliefState]:
+        return [
+            self.get_belief_state(
+                observation = observation,
+                previous_belief_state = previous_belief_state,
+                previous_action = previous_action,
+            ) for observation, previous_belief_state, previous_action in zip(
+                observations, 
+                previous_belief_states, 
+                previous_actions
+            )
+        ]
+
+    def encode_belief_state(self, belief_state:BeliefState) -> ndarray:
+        raise NotImplementedError
@@ -0,0 +1,68 @@
+from typing import Optional, Tuple, Union
+from numpy import arange, asarray, float32, ndarray, zeros
+#=======================
+#=======================
+
+class SlidingWindow:
+    def __init__(
+        self,
+        capacity:int,
+        feature_shape:Union[int,Tuple[int,...]],
+        dtype:type = float32,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.feature_shape = (feature_shape,) if isinstance(feature_shape, int) else tuple(feature_shape)
+        self.buffer = zeros((2*capacity, *self.feature_shape), dtype=dtype)
+        self.position = 0
+        self.size = 0
+
+    def __str__(self) -> str:
+        return f"{__class__.__name__}(size={self.size}, capacity={self.capacity}, feature_shape={self.feature_shape})"
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index:Union[int,slice]) -> ndarray:
+        return self.view()[index]
+
+    def __array__(self, dtype:Optional[type] = None, copy:Optional[bool] = None) -> ndarray:
+        window = self.view()
+        if dtype is not None and window.dtype != dtype:
+            if copy is False:
+                raise ValueError(f"cannot convert a {window.dtype} window to {dtype} without copying")
+            return window.astype(dtype)
+        return window.copy() if copy else window
+
+    def is_full(self) -> bool:
+        return self.size == self.capacity
+
+    def clear(self) -> None:
+        self.position = 0
+        self.size = 0
+
+    def push(self, features:ndarray) -> None:
+        self.buffer[self.position] = features
+        self.buffer[self.position + self.capacity] = features
+        self.position = (self.position + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, batch_of_features:ndarray) -> None:
+        batch_of_features = asarray(batch_of_features)[-self.capacity:]
+        number_of_rows = len(batch_of_features)
+        rows = (self.position + arange(number_of_rows)) % self.capacity
+        self.buffer[rows] = batch_of_features
+        self.buffer[rows + self.capacity] = batch_of_features
+        self.position = (self.position + number_of_rows) % self.capacity
+        self.size = min(self.size + number_of_rows, self.capacity)
+
+    def view(self) -> ndarray:
+        start = (self.position - self.size) % self.capacity
+        window = self.buffer[start:start + self.size]
+        window.flags.writeable = False
+        return window
+
+    def latest(self, number_of_steps:int = 1) -> ndarray:
+        window = self.view()
+        return window[len(window) - min(number_of_steps, len(window)):]
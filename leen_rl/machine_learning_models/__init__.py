@@ -0,0 +1,5 @@
+#=======================
+from .recursive_least_squares import RecursiveLeastSquares
+from .extreme_learning_machine import ExtremeLearningMachine
+from .prototype_classifier import PrototypeClassifier, PrototypeMatch
+#=======================
@@ -0,0 +1,54 @@
+from math import sqrt
+from typing import Optional
+from numpy import asarray, eye, ndarray, repeat, tanh, zeros
+from numpy.random import default_rng
+#=======================
+from .recursive_least_squares import update_recursive_least_squares
+#=======================
+
+class ExtremeLearningMachine:
+    def initialise_model(
+        self,
+        feature_size:int,
+        output_size:int = 1,
+        number_of_readouts:int = 1,
+        hidden_size:Optional[int] = None,
+        forgetting_factor:float = 1.,
+        regularisation:float = 1e-2,
+        seed:Optional[int] = None,
+    ) -> None:
+        random_generator = default_rng(seed)
+        if hidden_size:
+            self.input_weights = random_generator.standard_normal((feature_size, hidden_size)) / sqrt(feature_size)
+            self.hidden_biases = random_generator.standard_normal(hidden_size)
+        else:
+            self.input_weights = None
+            self.hidden_biases = None
+        readout_input_size = hidden_size if hidden_size else feature_size
+        self.forgetting_factor = forgetting_factor
+        self.readout_weights = zeros((number_of_readouts, readout_input_size, output_size))
+        self.inverse_covariances = repeat(
+            eye(readout_input_size)[None] / regularisation,
+            number_of_readouts,
+            axis = 0
+        )
+        self.number_of_updates = 0
+
+    def project(self, features:ndarray) -> ndarray:
+        features = asarray(features, dtype=float)
+        if self.input_weights is None:
+            return features
+        return tanh(features @ self.input_weights + self.hidden_biases)
+
+    def predict(self, features:ndarray, readout:int = 0) -> ndarray:
+        return self.project(features) @ self.readout_weights[readout]
+
+    def update(self, features:ndarray, targets:ndarray, readout:int = 0) -> None:
+        update_recursive_least_squares(
+            weights = self.readout_weights[readout],
+            inverse_covariance = self.inverse_covariances[readout],
+            input_vector = self.project(features),
+            target_vector = targets,
+            forgetting_factor = self.forgetting_factor,
+        )
+        self.number_of_updates += 1
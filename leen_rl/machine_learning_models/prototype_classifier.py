@@ -0,0 +1,75 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from numpy import argpartition, asarray, float32, ndarray, sqrt, vstack, where, zeros
+#=======================
+#=======================
+
+class PrototypeMatch(NamedTuple):
+    label:Optional[str]
+    similarity:float
+
+class PrototypeClassifier:
+    def __init__(
+        self,
+        prototypes:Optional[Dict[str,Sequence[float]]] = None,
+        rejection_threshold:Optional[float] = None,
+        dtype:type = float32,
+    ) -> None:
+        self.rejection_threshold = rejection_threshold
+        self.dtype = dtype
+        self.labels:List[str] = []
+        self.prototype_matrix = zeros((0, 0), dtype=dtype)
+        if prototypes:
+            self.register_prototypes(prototypes)
+
+    def __str__(self) -> str:
+        return f"{__class__.__name__}(prototypes={len(self.labels)}, features={self.prototype_matrix.shape[1]})"
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def register_prototypes(self, prototypes:Dict[str,Sequence[float]]) -> None:
+        labels = list(prototypes)
+        new_prototypes = self._normalise(
+            asarray([asarray(prototypes[label], dtype=self.dtype).ravel() for label in labels])
+        )
+        self.prototype_matrix = vstack([self.prototype_matrix, new_prototypes]) if self.labels else new_prototypes
+        self.labels += labels
+
+    def register_prototype(self, label:str, prototype:Sequence[float]) -> None:
+        self.register_prototypes({label: prototype})
+
+    def _normalise(self, vectors:ndarray) -> ndarray:
+        norms = sqrt((vectors*vectors).sum(axis=1, keepdims=True))
+        return vectors / where(norms > 0, norms, 1)
+
+    def similarities(self, batch_of_features:ndarray) -> ndarray:
+        batch_of_features = asarray(batch_of_features, dtype=self.dtype)
+        return self._normalise(
+            batch_of_features.reshape(len(batch_of_features), -1)
+        ) @ self.prototype_matrix.T
+
+    def _match(self, prototype_index:int, similarity:float) -> PrototypeMatch:
+        if self.rejection_threshold is not None and similarity < self.rejection_threshold:
+            return PrototypeMatch(label=None, similarity=similarity)
+        return PrototypeMatch(label=self.labels[prototype_index], similarity=similarity)
+
+    def classify_batch(self, batch_of_features:ndarray) -> List[PrototypeMatch]:
+        similarities = self.similarities(batch_of_features)
+        best_indices = similarities.argmax(axis=1)
+        return [
+            self._match(prototype_index=int(index), similarity=float(row[index]))
+            for index, row in zip(best_indices, similarities)
+        ]
+
+    def classify(self, features:ndarray) -> PrototypeMatch:
+        return self.classify_batch(asarray(features)[None])[0]
+
+    def k_nearest(self, features:ndarray, k:int) -> List[PrototypeMatch]:
+        similarities = self.similarities(asarray(features)[None])[0]
+        k = min(k, len(self.labels))
+        nearest_indices = argpartition(-similarities, k - 1)[:k]
+        nearest_indices = nearest_indices[(-similarities[nearest_indices]).argsort()]
+        return [
+            self._match(prototype_index=int(index), similarity=float(similarities[index]))
+            for index in nearest_indices
+        ]
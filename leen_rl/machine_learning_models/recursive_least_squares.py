@@ -0,0 +1,45 @@
+from numpy import asarray, eye, ndarray, outer, zeros
+#=======================
+#=======================
+
+def update_recursive_least_squares(
+    weights:ndarray,
+    inverse_covariance:ndarray,
+    input_vector:ndarray,
+    target_vector:ndarray,
+    forgetting_factor:float = 1.,
+) -> None:
+    input_vector = asarray(input_vector, dtype=float)
+    projected_input = inverse_covariance @ input_vector
+    gain = projected_input / (forgetting_factor + input_vector @ projected_input)
+    prediction_error = asarray(target_vector, dtype=float) - input_vector @ weights
+    weights += outer(gain, prediction_error)
+    inverse_covariance -= outer(gain, projected_input)
+    if forgetting_factor != 1.:
+        inverse_covariance /= forgetting_factor
+
+class RecursiveLeastSquares:
+    def __init__(
+        self,
+        input_size:int,
+        output_size:int = 1,
+        forgetting_factor:float = 1.,
+        regularisation:float = 1e-2,
+    ) -> None:
+        self.forgetting_factor = forgetting_factor
+        self.weights = zeros((input_size, output_size))
+        self.inverse_covariance = eye(input_size) / regularisation
+        self.number_of_updates = 0
+
+    def predict(self, inputs:ndarray) -> ndarray:
+        return inputs @ self.weights
+
+    def update(self, input_vector:ndarray, target_vector:ndarray) -> None:
+        update_recursive_least_squares(
+            weights = self.weights,
+            inverse_covariance = self.inverse_covariance,
+            input_vector = input_vector,
+            target_vector = target_vector,
+            forgetting_factor = self.forgetting_factor,
+        )
+        self.number_of_updates += 1
@@ -0,0 +1,43 @@
+from types import FunctionType, MethodType, ModuleType
+from typing import Any, Iterator, Optional, Set, Tuple
+from numpy import ndarray
+from numpy.random import Generator
+#=======================
+#=======================
+SCALAR_TYPES = (bool, int, float, str, type(None))
+MAX_DEPTH = 2
+
+def _holds_state(value:Any) -> bool:
+    return hasattr(value, "__dict__") and not isinstance(value, (type, ModuleType, FunctionType, MethodType))
+
+def find_object_state(
+    owner:Any, 
+    path:str, 
+    depth:int = 0, 
+    visited:Optional[Set[int]] = None,
+) -> Iterator[Tuple[str,Any,str,Any]]:
+    visited = set() if visited is None else visited
+    if id(owner) in visited:
+        return
+    visited.add(id(owner))
+    for name, value in list(getattr(owner, "__dict__", {}).items()):
+        if isinstance(value, (ndarray, Generator) + SCALAR_TYPES):
+            yield f"{path}.{name}", owner, name, value
+        elif depth >= MAX_DEPTH:
+            continue
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                if _holds_state(item):
+                    yield from find_object_state(
+                        owner = item, 
+                        path = f"{path}.{name}.{index}", 
+                        depth = depth + 1, 
+                        visited = visited,
+                    )
+        elif _holds_state(value):
+            yield from find_object_state(
+                owner = value, 
+                path = f"{path}.{name}", 
+                depth = depth + 1, 
+                visited = visited,
+            )
@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from os import cpu_count
+from random import seed as seed_python_random
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from numpy.random import Generator, SeedSequence, seed as seed_numpy_random
+#=======================
+from .agent_experiment import Agent, RLExperiment
+from .object_state import find_object_state
+#=======================
+
+class RolloutTask(NamedTuple):
+    seed:int
+    number_of_steps:int
+    config:Hashable = None
+
+class RolloutResult(NamedTuple):
+    seed:int
+    number_of_steps:int
+    config:Hashable
+    trajectory:Optional[List[Any]]
+    summary:Any
+
+_WORKER_SETTINGS:Dict[str, Any] = {}
+_WARM_EXPERIMENTS:Dict[Hashable, Tuple[RLExperiment, Agent, Any]] = {}
+
+def _initialise_worker(
+    experiment_factory:Callable[[Hashable], RLExperiment],
+    record_step:Optional[Callable[[RLExperiment], Any]],
+    summarise:Optional[Callable[[RLExperiment], Any]],
+) -> None:
+    _WORKER_SETTINGS.update(
+        experiment_factory = experiment_factory,
+        record_step = record_step,
+        summarise = summarise,
+    )
+    _WARM_EXPERIMENTS.clear()
+
+def _get_warm_experiment(config:Hashable) -> Tuple[RLExperiment, Agent, Any]:
+    if config not in _WARM_EXPERIMENTS:
+        experiment = _WORKER_SETTINGS["experiment_factory"](config)
+        experiment.verbose = False
+        _WARM_EXPERIMENTS[config] = (
+            experiment, 
+            deepcopy(experiment.agent), 
+            deepcopy(experiment.replay_buffer),
+        )
+    return _WARM_EXPERIMENTS[config]
+
+def _reseed_generators(seed:int, owners:Dict[str,Any]) -> None:
+    generators = [
+        value for path, owner in owners.items() if owner is not None
+        for _, _, _, value in find_object_state(owner=owner, path=path)
+        if isinstance(value, Generator)
+    ]
+    for generator, seed_sequence in zip(generators, SeedSequence(seed).spawn(len(generators))):
+        generator.bit_generator.state = type(generator.bit_generator)(seed_sequence).state
+
+def _reset_experiment(
+    experiment:RLExperiment, 
+    pristine_agent:Agent, 
+    pristine_replay_buffer:Any, 
+    seed:int,
+) -> None:
+    seed_python_random(seed)
+    seed_numpy_random(seed)
+    experiment.agent = deepcopy(pristine_agent)
+    experiment.replay_buffer = deepcopy(pristine_replay_buffer)
+    _reseed_generators(
+        seed = seed,
+        owners = {
+            "environment": experiment.environment,
+            "agent.sensor": experiment.agent.sensor,
+            "agent.cognitive_map": experiment.agent.cognitive_map,
+            "agent.policy": experiment.agent.policy,
+            "replay_buffer": experiment.replay_buffer,
+        },
+    )
+    experiment.environment.initialise_state()
+    experiment.action = None
+    experiment.number_of_steps_taken = 0
+    experiment._pending_transition = None
+
+def _run_rollout(task:RolloutTask) -> RolloutResult:
+    experiment, pristine_agent, pristine_replay_buffer = _get_warm_experiment(task.config)
+    _reset_experiment(
+        experiment = experiment,
+        pristine_agent = pristine_agent,
+        pristine_replay_buffer = pristine_replay_buffer,
+        seed = task.seed,
+    )
+
+    record_step = _WORKER_SETTINGS["record_step"]
+    summarise = _WORKER_SETTINGS["summarise"]
+    trajectory = [] if record_step else None
+    for _ in range(task.number_of_steps):
+        experiment._step()
+        if record_step:
+            trajectory.append(record_step(experiment))
+
+    return RolloutResult(
+        seed = task.seed,
+        number_of_steps = task.number_of_steps,
+        config = task.config,
+        trajectory = trajectory,
+        summary = summarise(experiment) if summarise else None,
+    )
+
+class ParallelRollouts:
+    def __init__(
+        self,
+        experiment_factory:Callable[[Hashable], RLExperiment],
+        record_step:Optional[Callable[[RLExperiment], Any]] = None,
+        summarise:Optional[Callable[[RLExperiment], Any]] = None,
+        number_of_workers:Optional[int] = None,
+        chunk_size:int = 16,
+    ) -> None:
+        self.experiment_factory = experiment_factory
+        self.record_step = record_step
+        self.summarise = summarise
+        self.number_of_workers = cpu_count() if number_of_workers is None else number_of_workers
+        self.chunk_size = chunk_size
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(workers={self.number_of_workers}, chunk_size={self.chunk_size})"
+
+    def run(self, tasks:Iterable[RolloutTask]) -> Iterator[RolloutResult]:
+        worker_settings = (self.experiment_factory, self.record_step, self.summarise)
+        if not self.number_of_workers:
+            _initialise_worker(*worker_settings)
+            yield from map(_run_rollout, tasks)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers = self.number_of_workers,
+            initializer = _initialise_worker,
+            initargs = worker_settings,
+        ) as executor:
+            yield from executor.map(_run_rollout, tasks, chunksize=self.chunk_size)
+
+    def run_seeds(
+        self,
+        seeds:Iterable[int],
+        number_of_steps:int = 100,
+        config:Hashable = None,
+    ) -> Iterator[RolloutResult]:
+        return self.run(
+            RolloutTask(
+                seed = seed,
+                number_of_steps = number_of_steps,
+                config = config,
+            ) for seed in seeds
+        )
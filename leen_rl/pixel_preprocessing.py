@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional, Tuple
+from numpy import add, arange, asarray, diff, empty, float32, matmul, multiply, ndarray, outer, stack
+#=======================
+from .environment_sensor_map import Environment, Sensor
+from .history import SlidingWindow
+from .state_action import Observation
+#=======================
+
+class PixelPreprocessor:
+    def __init__(
+        self,
+        input_shape:Tuple[int,int,int],
+        output_size:Tuple[int,int],
+        crop:Tuple[int,int,int,int] = (0, 0, 0, 0),
+        greyscale:bool = True,
+        luma_weights:Tuple[float,...] = (.2989, .587, .114),
+        scale:float = 1/255,
+        dtype:type = float32,
+    ) -> None:
+        height, width, number_of_channels = input_shape
+        top, bottom, left, right = crop
+        self.input_shape = tuple(input_shape)
+        self.rows = slice(top, height - bottom)
+        self.columns = slice(left, width - right)
+        cropped_height = height - top - bottom
+        cropped_width = width - left - right
+        output_height, output_width = output_size
+        if not (0 < output_height <= cropped_height and 0 < output_width <= cropped_width):
+            raise ValueError(f"cannot downsample a {cropped_height}x{cropped_width} crop to {output_height}x{output_width}")
+
+        self.row_starts = arange(output_height) * cropped_height // output_height
+        self.column_starts = arange(output_width) * cropped_width // output_width
+        area_of_each_cell = outer(
+            diff(self.row_starts, append=cropped_height),
+            diff(self.column_starts, append=cropped_width),
+        )
+        self.greyscale = greyscale
+        self.dtype = dtype
+        if greyscale:
+            self.channel_weights = asarray(luma_weights, dtype=dtype) * scale
+            self.cell_weights = (1 / area_of_each_cell).astype(dtype)
+            self.output_shape = (output_height, output_width)
+        else:
+            self.cell_weights = (scale / area_of_each_cell).astype(dtype)[:,:,None]
+            self.output_shape = (output_height, output_width, number_of_channels)
+        self._buffers:Dict[int,Tuple[ndarray,ndarray,ndarray]] = {}
+
+    def __str__(self) -> str:
+        return f"{__class__.__name__}({self.input_shape} -> {self.output_shape})"
+
+    def _get_buffers(self, batch_size:int) -> Tuple[ndarray,ndarray,ndarray]:
+        buffers = self._buffers.get(batch_size)
+        if buffers is None:
+            output_height, output_width = self.output_shape[:2]
+            number_of_channels = self.input_shape[2]
+            cropped_width = self.columns.stop - self.columns.start
+            buffers = self._buffers[batch_size] = (
+                empty((batch_size, output_height, cropped_width, number_of_channels), dtype=self.dtype),
+                empty((batch_size, output_height, output_width, number_of_channels), dtype=self.dtype),
+                empty((batch_size, *self.output_shape), dtype=self.dtype),
+            )
+        return buffers
+
+    def process_batch(self, frames:ndarray, out:Optional[ndarray] = None) -> ndarray:
+        row_sums, cell_sums, processed_frames = self._get_buffers(len(frames))
+        if out is not None:
+            processed_frames = out
+        add.reduceat(
+            frames[:, self.rows, self.columns],
+            self.row_starts,
+            axis = 1,
+            dtype = self.dtype,
+            out = row_sums
+        )
+        add.reduceat(row_sums, self.column_starts, axis=2, out=cell_sums)
+        if self.greyscale:
+            matmul(cell_sums, self.channel_weights, out=processed_frames)
+            processed_frames *= self.cell_weights
+        else:
+            multiply(cell_sums, self.cell_weights, out=processed_frames)
+        return processed_frames
+
+    def process(self, frame:ndarray, out:Optional[ndarray] = None) -> ndarray:
+        return self.process_batch(
+            frames = frame[None],
+            out = None if out is None else out[None]
+        )[0]
+
+class PreprocessedSensor(Sensor):
+    def __init__(
+        self,
+        sensor:Sensor,
+        preprocessor:PixelPreprocessor,
+        pixel_field:str = "pixels",
+        number_of_stacked_frames:int = 1,
+        reuse_output_buffers:bool = False,
+    ) -> None:
+        self.sensor = sensor
+        self.preprocessor = preprocessor
+        self.pixel_field = pixel_field
+        self.number_of_stacked_frames = number_of_stacked_frames
+        self.reuse_output_buffers = reuse_output_buffers
+        self.frame_stacks:List[SlidingWindow] = []
+
+    def reset(self) -> None:
+        for frame_stack in self.frame_stacks:
+            frame_stack.clear()
+
+    def get_observation(self, state:Environment) -> Observation:
+        return self._preprocess_observations(
+            observations = [self.sensor.get_observation(state)]
+        )[0]
+
+    def get_observations(self, states:List[Environment]) -> List[Observation]:
+        return self._preprocess_observations(
+            observations = self.sensor.get_observations(states)
+        )
+
+    def _preprocess_observations(self, observations:List[Observation]) -> List[Observation]:
+        processed_frames = self.preprocessor.process_batch(
+            frames = stack([getattr(observation, self.pixel_field) for observation in observations])
+        )
+        if self.number_of_stacked_frames > 1:
+            processed_frames = self._stack_frames(processed_frames)
+        return [
+            observation.evolve(
+                **{self.pixel_field: frames if self.reuse_output_buffers else frames.copy()}
+            ) for observation, frames in zip(observations, processed_frames)
+        ]
+
+    def _stack_frames(self, processed_frames:ndarray) -> List[ndarray]:
+        while len(self.frame_stacks) < len(processed_frames):
+            self.frame_stacks.append(
+                SlidingWindow(
+                    capacity = self.number_of_stacked_frames,
+                    feature_shape = self.preprocessor.output_shape,
+                    dtype = self.preprocessor.dtype,
+                )
+            )
+        stacked_frames = []
+        for frame_stack, frame in zip(self.frame_stacks, processed_frames):
+            while not frame_stack.is_full():
+                frame_stack.push(frame)
+            frame_stack.push(frame)
+            stacked_frames.append(frame_stack.view())
+        return stacked_frames
@@ -1,21 +1,47 @@
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from numpy import argmax, asarray, ndarray, stack
 #=======================
-from .state_action import Action, BeliefState, load_in_action_space
+from .state_action import Action, ActionSpace, ActionView, BeliefState, Observation, StructuredState
+from .state_action import belief_state_key, load_in_action_space
 #=======================
+def _is_implemented(approximator:Any, method_name:str, interface:type) -> bool:
+    return getattr(type(approximator), method_name) is not getattr(interface, method_name)
+
 class π:
     def infer_action(self, belief_state:BeliefState) -> Action:
         raise NotImplementedError
 
+    def infer_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        return [self.infer_action(belief_state) for belief_state in belief_states]
+
 class φ:
     def infer_belief_state(self, belief_state:BeliefState, action:Action) -> BeliefState:
         raise NotImplementedError
 
+    def infer_belief_states(self, belief_state:BeliefState, actions:ActionSpace) -> List[BeliefState]:
+        return [
+            self.infer_belief_state(
+                action = action,
+                belief_state = belief_state
+            ) for action in actions
+        ]
+
 class V:
     def infer_state_value(self, action:Action) -> float:
         raise NotImplementedError
 
+    def infer_state_values(self, belief_states:List[BeliefState]) -> ndarray:
+        raise NotImplementedError
+
 class Q:
     def infer_action_value(self, belief_state:BeliefState, action:Action) -> float:
         raise NotImplementedError
+
+    def infer_action_values(self, belief_state:BeliefState, actions:ActionSpace) -> ndarray:
+        raise NotImplementedError
     
 class Policy:
     def __init__(self,action_space_path: str) -> None:
@@ -24,6 +50,9 @@ class Policy:
     def get_action(self, belief_state:BeliefState) -> Action:
         raise NotImplementedError
 
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        return [self.get_action(belief_state) for belief_state in belief_states]
+
 class PolicyFunction(Policy, π):
     def __str__(self) -> str:
         return __class__.__name__
@@ -31,24 +60,58 @@ class PolicyFunction(Policy, π):
     def get_action(self, belief_state:BeliefState) -> Action:
         return self.infer_action(belief_state)
 
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        return self.infer_actions(belief_states)
+
 class QFunction(Policy, Q):
     def __str__(self) -> str:
         return __class__.__name__
 
     def get_action(self, belief_state:BeliefState) -> Action:
+        if _is_implemented(self, "infer_action_values", Q):
+            return self.action_space[
+                int(argmax(
+                    self.infer_action_values(
+                        belief_state = belief_state,
+                        actions = self.action_space,
+                    )
+                ))
+            ]
         return max(
             self.action_space,
             key = lambda action: self.infer_action_value(
                 action = action,
                 belief_state = belief_state,
             )
-        )          
+        )
+
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        if not belief_states or not _is_implemented(self, "infer_action_values", Q):
+            return super().get_actions(belief_states)
+        action_values = stack([
+            self.infer_action_values(
+                belief_state = belief_state,
+                actions = self.action_space,
+            ) for belief_state in belief_states
+        ])
+        return [self.action_space[int(index)] for index in action_values.argmax(axis=1)]
         
 class ValueFunction(Policy, V, φ):
     def __str__(self) -> str:
         return __class__.__name__
 
     def get_action(self, belief_state:BeliefState) -> Action:
+        if _is_implemented(self, "infer_state_values", V):
+            return self.action_space[
+                int(argmax(
+                    self.infer_state_values(
+                        belief_states = self.infer_belief_states(
+                            actions = self.action_space,
+                            belief_state = belief_state
+                        )
+                    )
+                ))
+            ]
         return max(
             self.action_space,
             key = lambda action: self.infer_state_value(
@@ -57,4 +120,122 @@ class ValueFunction(Policy, V, φ):
                     belief_state = belief_state
                 )
             )
-        )
\ No newline at end of file
+        )
+
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        if not belief_states or not _is_implemented(self, "infer_state_values", V):
+            return super().get_actions(belief_states)
+        next_belief_states = [
+            next_belief_state
+            for belief_state in belief_states
+            for next_belief_state in self.infer_belief_states(
+                actions = self.action_space,
+                belief_state = belief_state
+            )
+        ]
+        state_values = asarray(self.infer_state_values(belief_states=next_belief_states))
+        state_values = state_values.reshape(len(belief_states), len(self.action_space))
+        return [self.action_space[int(index)] for index in state_values.argmax(axis=1)]
+
+def _action_key(action:Action) -> Hashable:
+    return action if isinstance(action, ActionView) else belief_state_key(action)
+
+def _argument_key(name:str, value:Any, approximator:"MemoisedApproximator") -> Hashable:
+    if name == "belief_state":
+        return approximator.get_cache_key(value)
+    if isinstance(value, Action):
+        return _action_key(value)
+    if isinstance(value, (BeliefState, Observation, StructuredState)):
+        return belief_state_key(value)
+    return value
+
+def _memoise_method(method_name:str, method:Callable) -> Callable:
+    method_signature = signature(method)
+
+    @wraps(method)
+    def memoised_method(self:"MemoisedApproximator", *arguments:Any, **keyword_arguments:Any) -> Any:
+        compute_result = lambda: method(self, *arguments, **keyword_arguments)
+        try:
+            bound_arguments = list(method_signature.bind(self, *arguments, **keyword_arguments).arguments.items())[1:]
+            key = (
+                method_name,
+                *((name, _argument_key(name=name, value=value, approximator=self)) for name, value in bound_arguments),
+                *(getattr(self, name) for name in self.cache_context_fields),
+            )
+        except TypeError:
+            return compute_result()
+        return self._get_memoised_result(key=key, compute_result=compute_result)
+    memoised_method.is_memoised = True
+    return memoised_method
+
+def _invalidate_after(method:Callable) -> Callable:
+    @wraps(method)
+    def invalidating_method(self:"MemoisedApproximator", *arguments:Any, **keyword_arguments:Any) -> Any:
+        try:
+            return method(self, *arguments, **keyword_arguments)
+        finally:
+            self.clear_cache()
+    invalidating_method.is_memoised = True
+    return invalidating_method
+
+class MemoisedApproximator:
+    cache_size:int = 4096
+    cache_key_fields:Optional[Tuple[str,...]] = None
+    cache_context_fields:Tuple[str,...] = ()
+    cache_hits = 0
+    cache_misses = 0
+    cache_evictions = 0
+    cache_invalidating_methods:Tuple[str,...] = ("learn", "learn_batch", "learn_from_transitions", "update")
+    memoised_methods:Tuple[str,...] = ("infer_action", "infer_state_value", "infer_belief_state", "infer_action_value")
+
+    def __init_subclass__(cls, **keyword_arguments:Any) -> None:
+        super().__init_subclass__(**keyword_arguments)
+        cls.cache_context_fields = tuple(dict.fromkeys(
+            field for klass in reversed(cls.__mro__) 
+            for field in klass.__dict__.get("cache_context_fields", ())
+        ))
+        for method_name in cls.memoised_methods:
+            method = getattr(cls, method_name, None)
+            if method is not None and not getattr(method, "is_memoised", False):
+                setattr(cls, method_name, _memoise_method(method_name, method))
+        for method_name in cls.cache_invalidating_methods:
+            method = getattr(cls, method_name, None)
+            if method is not None and not getattr(method, "is_memoised", False):
+                setattr(cls, method_name, _invalidate_after(method))
+
+    def get_cache_key(self, belief_state:BeliefState) -> Hashable:
+        return belief_state_key(belief_state, fields=self.cache_key_fields)
+
+    def _get_memoised_result(self, key:Hashable, compute_result:Callable[[], Any]) -> Any:
+        cache = self.__dict__.get("_memoised_results")
+        if cache is None:
+            cache = self._memoised_results = OrderedDict()
+        try:
+            result = cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return compute_result()
+        else:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return result
+
+        self.cache_misses += 1
+        result = cache[key] = compute_result()
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+            self.cache_evictions += 1
+        return result
+
+    def clear_cache(self) -> None:
+        self.__dict__.pop("_memoised_results", None)
+
+    def cache_info(self) -> Dict[str,int]:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions,
+            "size": len(self.__dict__.get("_memoised_results", ())),
+            "max_size": self.cache_size,
+        }
@@ -1,29 +1,50 @@
-from typing import Optional
-from random import choice, sample
+from collections import Counter
+from math import log, sqrt
+from random import choice
+from time import perf_counter
+from typing import Dict, Hashable, Optional, List, Sequence, Tuple
+from numpy import arange, argmax, asarray, bincount, finfo, float32, full, int64, ndarray, repeat, tile, unique, where, zeros
+from numpy.random import default_rng
 #=======================
-from .policy_approximator import Policy, PolicyFunction, ValueFunction, load_in_action_space
-from .state_action import Action, BeliefState
-#from .machine_learning_models.extreme_learning_machine import ExtremeLearningMachine
+from .policy_approximator import Policy, PolicyFunction, QFunction, ValueFunction, load_in_action_space
+from .state_action import Action, ActionSpace, BeliefState, belief_state_key
+from .machine_learning_models.extreme_learning_machine import ExtremeLearningMachine
+from .replay_buffer import Transitions
 #=======================
 
+class _DeadlineReached(Exception):
+    pass
+
 class RandomExploration(Policy):
     def __str__(self) -> str:
         return __class__.__name__
 
     def get_action(self, belief_state:BeliefState) -> Action:
-        return choice(self.action_space)   
+        return self.action_space.random_action()
+
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        return self.action_space.random_actions(len(belief_states))
 
 
 class GoalPlanning(ValueFunction):
+    cache_context_fields:Tuple[str,...] = ("_search_depth",)
+
     def __init__(
         self,
         action_space_path: str,
         max_depth:int = 1,
         sample_size:Optional[int] = None,
+        time_budget:Optional[float] = None,
     ) -> None:
         self.action_space = load_in_action_space(action_space_path)
         self.max_depth = max_depth
         self.sample_size = sample_size if sample_size else len(self.action_space)
+        self.time_budget = time_budget
+        self.deadline_misses = 0
+        self.reached_depth = max_depth
+        self.reached_depth_counts = Counter()
+        self._search_depth = max_depth
+        self._deadline = float("inf")
 
     def __str__(self) -> str:
         return __class__.__name__
@@ -35,14 +56,38 @@ class GoalPlanning(ValueFunction):
         discount_factor = 1/(depth+1)
         return self.infer_reward(belief_state) * discount_factor 
 
+    def get_action(self, belief_state:BeliefState) -> Action:
+        if self.time_budget is None:
+            return super().get_action(belief_state)
+        return self._get_action_before_deadline(belief_state)
+
+    def _get_action_before_deadline(self, belief_state:BeliefState) -> Action:
+        self._deadline = perf_counter() + self.time_budget
+        best_action = self.action_space.random_action()
+        self.reached_depth = -1
+        try:
+            for search_depth in range(self.max_depth+1):
+                self._search_depth = search_depth
+                best_action = super().get_action(belief_state)
+                self.reached_depth = search_depth
+        except _DeadlineReached:
+            self.deadline_misses += 1
+        finally:
+            self._search_depth = self.max_depth
+            self._deadline = float("inf")
+        self.reached_depth_counts[self.reached_depth] += 1
+        return best_action
+
     def _planning_algorithm(
         self, 
         belief_state:BeliefState, 
         accumulated_reward:float = 0., 
         current_depth:int = 0
     ) -> float:
+        if perf_counter() > self._deadline:
+            raise _DeadlineReached
         scores_of_sampled_trajectories = []
-        for next_action in sample(self.action_space, k=self.sample_size):
+        for next_action in self.action_space.sample(k=self.sample_size):
             next_belief_state = self.infer_belief_state(
                 action = next_action,
                 belief_state = belief_state
@@ -51,7 +96,7 @@ class GoalPlanning(ValueFunction):
                 belief_state=next_belief_state,
                 depth=current_depth,
             )
-            if current_depth == self.max_depth:
+            if current_depth == self._search_depth:
                 return accumulated_reward
             future_score = self._planning_algorithm(
                 belief_state=next_belief_state,
@@ -64,5 +109,420 @@ class GoalPlanning(ValueFunction):
     def infer_state_value(self, belief_state:BeliefState) -> float:
         return self._planning_algorithm(belief_state)
 
-#class ELMPolicyFunction(PolicyFunction, ExtremeLearningMachine):
-    #TODO
\ No newline at end of file
+
+class _SearchNode:
+    __slots__ = ("belief_state", "reward", "visits", "action_visits", "action_returns", "children")
+
+    def __init__(self, belief_state:BeliefState, reward:float, number_of_actions:int) -> None:
+        self.belief_state = belief_state
+        self.reward = reward
+        self.visits = 0
+        self.action_visits = [0]*number_of_actions
+        self.action_returns = [0.]*number_of_actions
+        self.children:List[Optional[Tuple[Hashable,int]]] = [None]*number_of_actions
+
+class MonteCarloTreeSearch(GoalPlanning):
+    def __init__(
+        self,
+        action_space_path: str,
+        max_depth:int = 1,
+        number_of_simulations:int = 100,
+        exploration_constant:float = sqrt(2),
+        discount_factor:float = .9,
+        max_table_size:int = 100_000,
+        time_budget:Optional[float] = None,
+    ) -> None:
+        super().__init__(
+            action_space_path = action_space_path,
+            max_depth = max_depth,
+            time_budget = time_budget,
+        )
+        self.number_of_simulations = number_of_simulations
+        self.exploration_constant = exploration_constant
+        self.discount_factor = discount_factor
+        self.max_table_size = max_table_size
+        self.transposition_table:Dict[Tuple[Hashable,int],_SearchNode] = {}
+        self.planning_step = 0
+        self._lowest_return = float("inf")
+        self._highest_return = float("-inf")
+
+    def __str__(self) -> str:
+        return __class__.__name__
+
+    def hash_belief_state(self, belief_state:BeliefState) -> Hashable:
+        try:
+            return belief_state_key(belief_state)
+        except TypeError:
+            return object()
+
+    def get_action(self, belief_state:BeliefState) -> Action:
+        self._prune_transposition_table()
+        root = self._get_node(
+            key = (self.hash_belief_state(belief_state), self.planning_step),
+            belief_state = belief_state,
+        )
+        deadline = perf_counter() + self.time_budget if self.time_budget is not None else float("inf")
+        for _ in range(self.number_of_simulations):
+            if perf_counter() > deadline:
+                self.deadline_misses += 1
+                break
+            self._simulate(node=root, depth=0)
+        best_row = max(
+            range(len(self.action_space)),
+            key = lambda row: (
+                root.action_visits[row], 
+                self._mean_return(node=root, row=row)
+            )
+        )
+        self.planning_step += 1
+        return self.action_space[best_row]
+
+    def _prune_transposition_table(self) -> None:
+        if len(self.transposition_table) > self.max_table_size:
+            self.transposition_table = {
+                key:node for key,node in self.transposition_table.items() 
+                if key[1] >= self.planning_step
+            }
+        if len(self.transposition_table) > self.max_table_size:
+            self.transposition_table.clear()
+
+    def _get_node(self, key:Tuple[Hashable,int], belief_state:BeliefState) -> _SearchNode:
+        node = self.transposition_table.get(key)
+        if node is None:
+            node = _SearchNode(
+                belief_state = belief_state,
+                reward = self.infer_reward(belief_state),
+                number_of_actions = len(self.action_space),
+            )
+            self.transposition_table[key] = node
+        return node
+
+    def _mean_return(self, node:_SearchNode, row:int) -> float:
+        visits = node.action_visits[row]
+        return node.action_returns[row] / visits if visits else float("-inf")
+
+    def _normalise_return(self, value:float) -> float:
+        if self._highest_return > self._lowest_return:
+            return (value - self._lowest_return) / (self._highest_return - self._lowest_return)
+        return 0.
+
+    def _select_row(self, node:_SearchNode) -> int:
+        untried_rows = [row for row, visits in enumerate(node.action_visits) if not visits]
+        if untried_rows:
+            return choice(untried_rows)
+        exploration_scale = self.exploration_constant * sqrt(log(node.visits))
+        return max(
+            range(len(node.action_visits)),
+            key = lambda row: self._normalise_return(
+                self._mean_return(node=node, row=row)
+            ) + exploration_scale / sqrt(node.action_visits[row])
+        )
+
+    def _simulate(self, node:_SearchNode, depth:int) -> float:
+        row = self._select_row(node)
+        child = self.transposition_table.get(node.children[row])
+        is_new_child = child is None
+        if is_new_child:
+            next_belief_state = self.infer_belief_state(
+                action = self.action_space[row],
+                belief_state = node.belief_state,
+            )
+            child_key = (
+                self.hash_belief_state(next_belief_state), 
+                self.planning_step + depth + 1
+            )
+            node.children[row] = child_key
+            is_new_child = child_key not in self.transposition_table
+            child = self._get_node(key=child_key, belief_state=next_belief_state)
+
+        if depth == self.max_depth:
+            future_return = 0.
+        elif is_new_child:
+            future_return = self._rollout(belief_state=child.belief_state, depth=depth+1)
+        else:
+            future_return = self._simulate(node=child, depth=depth+1)
+        total_return = child.reward + self.discount_factor*future_return
+
+        node.visits += 1
+        node.action_visits[row] += 1
+        node.action_returns[row] += total_return
+        mean_return = self._mean_return(node=node, row=row)
+        self._lowest_return = min(self._lowest_return, mean_return)
+        self._highest_return = max(self._highest_return, mean_return)
+        return total_return
+
+    def _rollout(self, belief_state:BeliefState, depth:int) -> float:
+        total_return = 0.
+        discount = 1.
+        for _ in range(depth, self.max_depth+1):
+            belief_state = self.infer_belief_state(
+                action = self.action_space.random_action(),
+                belief_state = belief_state,
+            )
+            total_return += discount*self.infer_reward(belief_state)
+            discount *= self.discount_factor
+        return total_return
+
+class BatchedRolloutPlanning(Policy):
+    def __init__(
+        self,
+        action_space_path: str,
+        max_depth:int = 1,
+        number_of_rollouts:int = 256,
+        discount_factor:float = .9,
+        action_columns:Optional[Sequence[str]] = None,
+        seed:Optional[int] = None,
+    ) -> None:
+        super().__init__(action_space_path=action_space_path)
+        self.max_depth = max_depth
+        self.number_of_rollouts = number_of_rollouts
+        self.discount_factor = discount_factor
+        self.action_vectors = self.action_space.to_array(columns=action_columns)
+        self.random_generator = default_rng(seed)
+
+    def __str__(self) -> str:
+        return __class__.__name__
+
+    def encode_belief_state(self, belief_state:BeliefState) -> ndarray:
+        raise NotImplementedError
+
+    def infer_next_states(self, states:ndarray, actions:ndarray) -> ndarray:
+        raise NotImplementedError
+
+    def infer_rewards(self, states:ndarray) -> ndarray:
+        raise NotImplementedError
+
+    def get_action(self, belief_state:BeliefState) -> Action:
+        number_of_actions = len(self.action_space)
+        number_of_trajectories = number_of_actions*self.number_of_rollouts
+        states = tile(
+            self.encode_belief_state(belief_state), 
+            (number_of_trajectories, 1)
+        )
+        action_rows = repeat(arange(number_of_actions), self.number_of_rollouts)
+        discounted_returns = zeros(number_of_trajectories)
+        discount = 1.
+        for _ in range(self.max_depth+1):
+            states = self.infer_next_states(
+                states = states,
+                actions = self.action_vectors[action_rows],
+            )
+            discounted_returns += discount*self.infer_rewards(states)
+            discount *= self.discount_factor
+            action_rows = self.random_generator.integers(
+                number_of_actions, 
+                size = number_of_trajectories
+            )
+        mean_returns = discounted_returns.reshape(
+            number_of_actions, 
+            self.number_of_rollouts
+        ).mean(axis=1)
+        return self.action_space[int(argmax(mean_returns))]
+
+class ELMPolicyFunction(PolicyFunction, ExtremeLearningMachine):
+    def __init__(
+        self,
+        action_space_path: str,
+        feature_size:int,
+        hidden_size:Optional[int] = None,
+        forgetting_factor:float = 1.,
+        regularisation:float = 1e-2,
+        seed:Optional[int] = None,
+    ) -> None:
+        super().__init__(action_space_path=action_space_path)
+        self.initialise_model(
+            feature_size = feature_size,
+            output_size = len(self.action_space),
+            hidden_size = hidden_size,
+            forgetting_factor = forgetting_factor,
+            regularisation = regularisation,
+            seed = seed,
+        )
+
+    def __str__(self) -> str:
+        return __class__.__name__
+
+    def encode_belief_state(self, belief_state:BeliefState) -> ndarray:
+        raise NotImplementedError
+
+    def infer_action(self, belief_state:BeliefState) -> Action:
+        action_scores = self.predict(self.encode_belief_state(belief_state))
+        return self.action_space[int(argmax(action_scores))]
+
+    def learn(self, belief_state:BeliefState, action:Action, weight:float = 1.) -> None:
+        targets = zeros(len(self.action_space))
+        targets[self.action_space.index_of(action)] = weight
+        self.update(
+            features = self.encode_belief_state(belief_state),
+            targets = targets,
+        )
+
+class ELMQFunction(QFunction, ExtremeLearningMachine):
+    def __init__(
+        self,
+        action_space_path: str,
+        feature_size:int,
+        hidden_size:Optional[int] = None,
+        forgetting_factor:float = 1.,
+        regularisation:float = 1e-2,
+        seed:Optional[int] = None,
+    ) -> None:
+        super().__init__(action_space_path=action_space_path)
+        self.initialise_model(
+            feature_size = feature_size,
+            number_of_readouts = len(self.action_space),
+            hidden_size = hidden_size,
+            forgetting_factor = forgetting_factor,
+            regularisation = regularisation,
+            seed = seed,
+        )
+
+    def __str__(self) -> str:
+        return __class__.__name__
+
+    def encode_belief_state(self, belief_state:BeliefState) -> ndarray:
+        raise NotImplementedError
+
+    def infer_action_value(self, belief_state:BeliefState, action:Action) -> float:
+        return float(
+            self.predict(
+                features = self.encode_belief_state(belief_state),
+                readout = self.action_space.index_of(action),
+            )[0]
+        )
+
+    def infer_action_values(self, belief_state:BeliefState, actions:ActionSpace) -> ndarray:
+        action_values = self.readout_weights[:,:,0] @ self.project(self.encode_belief_state(belief_state))
+        if actions is self.action_space:
+            return action_values
+        return action_values[[self.action_space.index_of(action) for action in actions]]
+
+    def learn(self, belief_state:BeliefState, action:Action, target_value:float) -> None:
+        self.update(
+            features = self.encode_belief_state(belief_state),
+            targets = [target_value],
+            readout = self.action_space.index_of(action),
+        )
+
+class TabularQLearning(QFunction):
+    def __init__(
+        self,
+        action_space_path: str,
+        number_of_states:int,
+        learning_rate:float = .1,
+        discount_factor:float = .99,
+        exploration_rate:float = .1,
+        on_policy:bool = False,
+        initial_value:float = 0.,
+        dtype:type = float32,
+        seed:Optional[int] = None,
+    ) -> None:
+        super().__init__(action_space_path=action_space_path)
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.exploration_rate = exploration_rate
+        self.on_policy = on_policy
+        self.q_table = full((number_of_states, len(self.action_space)), initial_value, dtype=dtype)
+        self.random_generator = default_rng(seed)
+
+    def __str__(self) -> str:
+        return f"{__class__.__name__}(states={self.q_table.shape[0]}, actions={self.q_table.shape[1]})"
+
+    def encode_belief_state(self, belief_state:BeliefState) -> int:
+        raise NotImplementedError
+
+    def infer_action_value(self, belief_state:BeliefState, action:Action) -> float:
+        return float(
+            self.q_table[
+                self.encode_belief_state(belief_state), 
+                self.action_space.index_of(action)
+            ]
+        )
+
+    def infer_action_values(self, belief_state:BeliefState, actions:ActionSpace) -> ndarray:
+        return self.q_table[self.encode_belief_state(belief_state)]
+
+    def get_action(self, belief_state:BeliefState) -> Action:
+        if self.random_generator.random() < self.exploration_rate:
+            return self.action_space.random_action()
+        return super().get_action(belief_state)
+
+    def get_actions(self, belief_states:List[BeliefState]) -> List[Action]:
+        state_indices = asarray(
+            [self.encode_belief_state(belief_state) for belief_state in belief_states], 
+            dtype = int64
+        )
+        action_rows = where(
+            self.random_generator.random(len(state_indices)) < self.exploration_rate,
+            self.random_generator.integers(len(self.action_space), size=len(state_indices)),
+            self.q_table[state_indices].argmax(axis=1),
+        )
+        return [self.action_space[int(row)] for row in action_rows]
+
+    def learn(
+        self,
+        belief_state:BeliefState,
+        action:Action,
+        reward:float,
+        next_belief_state:BeliefState,
+        done:bool = False,
+        next_action:Optional[Action] = None,
+    ) -> float:
+        td_errors = self.learn_batch(
+            state_indices = asarray([self.encode_belief_state(belief_state)]),
+            action_indices = asarray([self.action_space.index_of(action)]),
+            rewards = asarray([reward]),
+            next_state_indices = asarray([self.encode_belief_state(next_belief_state)]),
+            dones = asarray([done]),
+            next_action_indices = None if next_action is None else asarray([self.action_space.index_of(next_action)]),
+        )
+        return float(td_errors[0])
+
+    def learn_batch(
+        self,
+        state_indices:ndarray,
+        action_indices:ndarray,
+        rewards:ndarray,
+        next_state_indices:ndarray,
+        dones:Optional[ndarray] = None,
+        next_action_indices:Optional[ndarray] = None,
+    ) -> ndarray:
+        if self.on_policy:
+            if next_action_indices is None:
+                raise ValueError("on-policy (SARSA) updates need next_action_indices")
+            next_values = self.q_table[next_state_indices, next_action_indices]
+        else:
+            next_values = self.q_table[next_state_indices].max(axis=1)
+        if dones is not None:
+            next_values = where(dones, 0., next_values)
+        td_errors = rewards + self.discount_factor*next_values - self.q_table[state_indices, action_indices]
+        table_indices, occurrences = unique(
+            state_indices*self.q_table.shape[1] + action_indices, 
+            return_inverse = True
+        )
+        mean_td_errors = bincount(occurrences, weights=td_errors) / bincount(occurrences)
+        self.q_table.reshape(-1)[table_indices] += self.learning_rate*mean_td_errors
+        return td_errors
+
+    def _stored_state_indices(self, belief_features:ndarray) -> ndarray:
+        feature_dtype = belief_features.dtype
+        if feature_dtype.kind == "f" and finfo(feature_dtype).nmant + 1 < int(self.q_table.shape[0] - 1).bit_length():
+            raise ValueError(
+                f"{feature_dtype} belief features cannot hold all {self.q_table.shape[0]} state indices exactly, "
+                f"store them in a replay buffer with an integer or float64 feature_dtype"
+            )
+        return belief_features[:,0].astype(int64)
+
+    def learn_from_transitions(self, transitions:Transitions) -> ndarray:
+        if self.on_policy:
+            raise ValueError(
+                "on-policy (SARSA) updates need next_action_indices, which transitions do not record, "
+                "use learn_batch instead"
+            )
+        return self.learn_batch(
+            state_indices = self._stored_state_indices(transitions.belief_features),
+            action_indices = transitions.action_indices,
+            rewards = transitions.rewards,
+            next_state_indices = self._stored_state_indices(transitions.next_belief_features),
+            dones = transitions.dones,
+        )
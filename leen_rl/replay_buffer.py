@@ -0,0 +1,174 @@
+from typing import NamedTuple, Optional, Tuple
+from numpy import arange, asarray, float32, float64, int64, ndarray, ones, unique, zeros
+from numpy.random import default_rng
+#=======================
+#=======================
+
+class Transitions(NamedTuple):
+    belief_features:ndarray
+    action_indices:ndarray
+    rewards:ndarray
+    next_belief_features:ndarray
+    dones:ndarray
+    indices:ndarray
+    weights:ndarray
+
+class ReplayBuffer:
+    row_arrays:Tuple[str,...] = ("belief_features", "action_indices", "rewards", "next_belief_features", "dones")
+
+    def __init__(
+        self,
+        capacity:int,
+        feature_size:int,
+        feature_dtype:type = float32,
+        seed:Optional[int] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.belief_features = zeros((capacity, feature_size), dtype=feature_dtype)
+        self.next_belief_features = zeros((capacity, feature_size), dtype=feature_dtype)
+        self.action_indices = zeros(capacity, dtype=int64)
+        self.rewards = zeros(capacity, dtype=float32)
+        self.dones = zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+        self.number_of_insertions = 0
+        self.random_generator = default_rng(seed)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(size={self.size}, capacity={self.capacity})"
+
+    def add(
+        self,
+        belief_features:ndarray,
+        action_index:int,
+        reward:float,
+        next_belief_features:ndarray,
+        done:bool = False,
+    ) -> int:
+        index = self.position
+        self.belief_features[index] = belief_features
+        self.action_indices[index] = action_index
+        self.rewards[index] = reward
+        self.next_belief_features[index] = next_belief_features
+        self.dones[index] = done
+        self.position = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.number_of_insertions += 1
+        self._on_insert(asarray([index]))
+        return index
+
+    def add_batch(
+        self,
+        belief_features:ndarray,
+        action_indices:ndarray,
+        rewards:ndarray,
+        next_belief_features:ndarray,
+        dones:Optional[ndarray] = None,
+    ) -> ndarray:
+        batch_size = len(action_indices)
+        indices = (self.position + arange(batch_size)) % self.capacity
+        self.belief_features[indices] = belief_features
+        self.action_indices[indices] = action_indices
+        self.rewards[indices] = rewards
+        self.next_belief_features[indices] = next_belief_features
+        self.dones[indices] = False if dones is None else dones
+        self.position = (self.position + batch_size) % self.capacity
+        self.size = min(self.size + batch_size, self.capacity)
+        self.number_of_insertions += batch_size
+        self._on_insert(indices)
+        return indices
+
+    def sample(self, batch_size:int) -> Transitions:
+        if not self.size:
+            raise ValueError("cannot sample from an empty replay buffer")
+        return self._gather(
+            indices = self.random_generator.integers(self.size, size=batch_size),
+            weights = ones(batch_size, dtype=float32),
+        )
+
+    def _gather(self, indices:ndarray, weights:ndarray) -> Transitions:
+        return Transitions(
+            belief_features = self.belief_features[indices],
+            action_indices = self.action_indices[indices],
+            rewards = self.rewards[indices],
+            next_belief_features = self.next_belief_features[indices],
+            dones = self.dones[indices],
+            indices = indices,
+            weights = weights,
+        )
+
+    def _on_insert(self, indices:ndarray) -> None:
+        pass
+
+class PrioritisedReplayBuffer(ReplayBuffer):
+    def __init__(
+        self,
+        capacity:int,
+        feature_size:int,
+        alpha:float = .6,
+        beta:float = .4,
+        epsilon:float = 1e-6,
+        feature_dtype:type = float32,
+        seed:Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            capacity = capacity,
+            feature_size = feature_size,
+            feature_dtype = feature_dtype,
+            seed = seed,
+        )
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.
+        self.number_of_leaves = 1 << max(capacity - 1, 1).bit_length()
+        self.priority_tree = zeros(2*self.number_of_leaves, dtype=float64)
+
+    def sample(self, batch_size:int) -> Transitions:
+        if not self.size:
+            raise ValueError("cannot sample from an empty replay buffer")
+        total_priority = self.priority_tree[1]
+        segment = total_priority / batch_size
+        targets = (arange(batch_size) + self.random_generator.random(batch_size)) * segment
+        leaves = self._find_leaves(targets)
+        indices = (leaves - self.number_of_leaves).clip(0, self.size - 1)
+        probabilities = self.priority_tree[indices + self.number_of_leaves] / total_priority
+        weights = (self.size * probabilities) ** -self.beta
+        return self._gather(
+            indices = indices,
+            weights = (weights / weights.max()).astype(float32),
+        )
+
+    def update_priorities(self, indices:ndarray, priorities:ndarray) -> None:
+        priorities = abs(asarray(priorities, dtype=float64)) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self._set_priorities(indices=asarray(indices), priorities=priorities ** self.alpha)
+
+    def _on_insert(self, indices:ndarray) -> None:
+        self._set_priorities(
+            indices = indices,
+            priorities = ones(len(indices)) * self.max_priority ** self.alpha,
+        )
+
+    def _set_priorities(self, indices:ndarray, priorities:ndarray) -> None:
+        nodes = indices + self.number_of_leaves
+        self.priority_tree[nodes] = priorities
+        nodes = unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.priority_tree[nodes] = self.priority_tree[2*nodes] + self.priority_tree[2*nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = unique(nodes // 2)
+
+    def _find_leaves(self, targets:ndarray) -> ndarray:
+        nodes = ones(len(targets), dtype=int64)
+        while nodes[0] < self.number_of_leaves:
+            left_children = 2*nodes
+            left_priorities = self.priority_tree[left_children]
+            go_right = targets > left_priorities
+            targets = targets - left_priorities*go_right
+            nodes = left_children + go_right
+        return nodes
@@ -0,0 +1,176 @@
+from asyncio import Lock, Semaphore, StreamReader, StreamWriter, create_task, sleep, start_server, start_unix_server
+from collections import OrderedDict
+from inspect import isawaitable
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Optional
+#=======================
+from .agent_experiment import Agent
+from .environment_sensor_map import Environment
+from .state_action import Action
+from .step_profiler import PhaseTimer
+#=======================
+
+class ConversationSession(Environment):
+    def __init__(self, session_id:str) -> None:
+        self.session_id = session_id
+        super().__init__()
+
+    def initialise_state(self) -> None:
+        self.user_utterance = ""
+        self.belief_state = None
+        self.action = None
+        self.last_active_time = monotonic()
+        self.latency = PhaseTimer()
+        self.lock = Lock()
+        self.requests_in_flight = 0
+
+    def receive(self, utterance:str) -> None:
+        self.user_utterance = utterance
+        self.last_active_time = monotonic()
+
+    def update_state(self, action:Action) -> None:
+        self.action = action
+
+async def _resolve(value:Any) -> Any:
+    return await value if isawaitable(value) else value
+
+class SessionServer:
+    def __init__(
+        self,
+        agent:Agent,
+        max_sessions:int = 10_000,
+        max_concurrent_requests:int = 64,
+        idle_timeout:float = 300.,
+        format_reply:Callable[[Action], str] = str,
+        session_factory:Callable[[str], ConversationSession] = ConversationSession,
+    ) -> None:
+        self.agent = agent
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.format_reply = format_reply
+        self.session_factory = session_factory
+        self.sessions:"OrderedDict[str,ConversationSession]" = OrderedDict()
+        self.evicted_sessions = 0
+        self.handled_requests = 0
+        self._request_slots = Semaphore(max_concurrent_requests)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(sessions={len(self.sessions)}, requests={self.handled_requests})"
+
+    async def handle_message(self, session_id:str, utterance:str) -> str:
+        session = self._get_session(session_id)
+        session.requests_in_flight += 1
+        try:
+            async with session.lock, self._request_slots:
+                start_time = perf_counter()
+                session.receive(utterance)
+                action = await self._select_action(session)
+                session.update_state(action)
+                session.latency.record(perf_counter() - start_time)
+        finally:
+            session.requests_in_flight -= 1
+        self.handled_requests += 1
+        return self.format_reply(action)
+
+    async def _select_action(self, session:ConversationSession) -> Action:
+        observation = await _resolve(
+            self.agent.sensor.get_observation(session)
+        )
+        session.belief_state = self.agent.cognitive_map.get_belief_state(
+            previous_action = session.action,
+            previous_belief_state = session.belief_state,
+            observation = observation,
+        )
+        return await _resolve(
+            self.agent.policy.get_action(belief_state=session.belief_state)
+        )
+
+    def _get_session(self, session_id:str) -> ConversationSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = self.session_factory(session_id)
+            self._evict_least_recently_used(
+                number_of_sessions = len(self.sessions) - self.max_sessions,
+                newest_session_id = session_id,
+            )
+        else:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def _evict_least_recently_used(self, number_of_sessions:int, newest_session_id:str) -> None:
+        if number_of_sessions <= 0:
+            return
+        evictable_session_ids = []
+        for session_id, session in self.sessions.items():
+            if len(evictable_session_ids) == number_of_sessions:
+                break
+            if session_id != newest_session_id and not session.requests_in_flight:
+                evictable_session_ids.append(session_id)
+        for session_id in evictable_session_ids:
+            del self.sessions[session_id]
+        self.evicted_sessions += len(evictable_session_ids)
+
+    def evict_idle_sessions(self) -> int:
+        oldest_allowed_time = monotonic() - self.idle_timeout
+        idle_session_ids = [
+            session_id for session_id, session in self.sessions.items()
+            if session.last_active_time < oldest_allowed_time and not session.requests_in_flight
+        ]
+        for session_id in idle_session_ids:
+            del self.sessions[session_id]
+        self.evicted_sessions += len(idle_session_ids)
+        return len(idle_session_ids)
+
+    async def evict_idle_sessions_periodically(self, interval:Optional[float] = None) -> None:
+        while True:
+            await sleep(interval if interval is not None else self.idle_timeout / 2)
+            self.evict_idle_sessions()
+
+    def session_metrics(self) -> Dict[str,Dict[str,float]]:
+        return {
+            session_id: session.latency.summary() for session_id, session in self.sessions.items()
+        }
+
+    def metrics(self) -> Dict[str,int]:
+        return {
+            "active_sessions": len(self.sessions),
+            "evicted_sessions": self.evicted_sessions,
+            "handled_requests": self.handled_requests,
+        }
+
+    async def handle_connection(self, reader:StreamReader, writer:StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                session_id, _, utterance = line.decode().rstrip("\n").partition("\t")
+                reply = await self.handle_message(session_id=session_id, utterance=utterance)
+                writer.write(reply.replace("\n", " ").encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_tcp(self, host:str = "127.0.0.1", port:int = 8765) -> None:
+        await self._serve(await start_server(self.handle_connection, host=host, port=port))
+
+    async def serve_unix(self, path:str) -> None:
+        await self._serve(await start_unix_server(self.handle_connection, path=path))
+
+    async def _serve(self, server:Any) -> None:
+        eviction_task = create_task(self.evict_idle_sessions_periodically())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction_task.cancel()
+
+class FakeClient:
+    def __init__(self, server:SessionServer) -> None:
+        self.server = server
+
+    async def send(self, session_id:str, utterance:str) -> str:
+        return await self.server.handle_message(session_id=session_id, utterance=utterance)
+
+    async def converse(self, session_id:str, utterances:List[str]) -> List[str]:
+        return [await self.send(session_id=session_id, utterance=utterance) for utterance in utterances]
@@ -0,0 +1,187 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+from weakref import ref
+from numpy import dtype as numpy_dtype, int64, ndarray, prod, uint8
+#=======================
+from .environment_sensor_map import Environment, Sensor
+from .state_action import Observation
+#=======================
+HEADER_ALIGNMENT = 64
+_DEFERRED_FRAME_RINGS:List["SharedFrameRing"] = []
+
+def _attach_shared_memory(name:str) -> SharedMemory:
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        return SharedMemory(name=name)
+
+class StaleFrameError(LookupError):
+    pass
+
+class SharedFrameRing:
+    def __init__(
+        self,
+        frame_shape:Tuple[int,...],
+        dtype:type = uint8,
+        number_of_slots:int = 4,
+        name:Optional[str] = None,
+        create:bool = True,
+    ) -> None:
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = numpy_dtype(dtype)
+        self.number_of_slots = number_of_slots
+        self.owner = create
+        header_size = -(-8*(number_of_slots + 1) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+        frame_size = int(prod(self.frame_shape)) * self.dtype.itemsize
+        if create:
+            self.shared_memory = SharedMemory(name=name, create=True, size=header_size + number_of_slots*frame_size)
+        else:
+            self.shared_memory = _attach_shared_memory(name)
+        self.name = self.shared_memory.name
+        self.header_size = header_size
+        self._map_arrays()
+        if create:
+            self.slot_sequences[:] = 0
+            self._latest_sequence[0] = 0
+
+    def _map_arrays(self) -> None:
+        self.slot_sequences = ndarray((self.number_of_slots,), dtype=int64, buffer=self.shared_memory.buf)
+        self._latest_sequence = ndarray((1,), dtype=int64, buffer=self.shared_memory.buf, offset=8*self.number_of_slots)
+        self.frames = ndarray(
+            (self.number_of_slots, *self.frame_shape),
+            dtype = self.dtype,
+            buffer = self.shared_memory.buf,
+            offset = self.header_size,
+        )
+
+    @classmethod
+    def attach(
+        cls,
+        name:str,
+        frame_shape:Tuple[int,...],
+        dtype:str,
+        number_of_slots:int,
+    ) -> "SharedFrameRing":
+        return cls(
+            frame_shape = frame_shape,
+            dtype = dtype,
+            number_of_slots = number_of_slots,
+            name = name,
+            create = False,
+        )
+
+    def __reduce__(self) -> tuple:
+        return SharedFrameRing.attach, (self.name, self.frame_shape, self.dtype.str, self.number_of_slots)
+
+    def __str__(self) -> str:
+        return f"{__class__.__name__}({self.name!r}, frame_shape={self.frame_shape}, latest={self.latest_sequence})"
+
+    def __enter__(self) -> "SharedFrameRing":
+        return self
+
+    def __exit__(self, *exception_information:object) -> None:
+        try:
+            self.close()
+        except BufferError:
+            _DEFERRED_FRAME_RINGS.append(self)
+        if self.owner:
+            self.unlink()
+
+    @property
+    def latest_sequence(self) -> int:
+        return int(self._latest_sequence[0])
+
+    def begin_write(self) -> Tuple[int,ndarray]:
+        sequence = self.latest_sequence + 1
+        slot = sequence % self.number_of_slots
+        self.slot_sequences[slot] = -sequence
+        return sequence, self.frames[slot]
+
+    def commit_write(self, sequence:int) -> None:
+        self.slot_sequences[sequence % self.number_of_slots] = sequence
+        self._latest_sequence[0] = sequence
+
+    def write(self, frame:ndarray) -> int:
+        sequence, slot_frame = self.begin_write()
+        slot_frame[...] = frame
+        self.commit_write(sequence)
+        return sequence
+
+    def is_current(self, sequence:int) -> bool:
+        return sequence > 0 and int(self.slot_sequences[sequence % self.number_of_slots]) == sequence
+
+    def read(self, sequence:Optional[int] = None) -> Tuple[int,ndarray]:
+        if sequence is None:
+            sequence = self.latest_sequence
+        if not sequence:
+            raise StaleFrameError(f"no frame has been written to {self.name!r} yet")
+        if not self.is_current(sequence):
+            raise StaleFrameError(f"frame {sequence} is no longer in {self.name!r}")
+        frame = self.frames[sequence % self.number_of_slots]
+        frame.flags.writeable = False
+        return sequence, frame
+
+    def copy_frame(self, sequence:Optional[int] = None, out:Optional[ndarray] = None) -> Tuple[int,ndarray]:
+        sequence, frame = self.read(sequence)
+        if out is None:
+            out = frame.copy()
+        else:
+            out[...] = frame
+        if not self.is_current(sequence):
+            raise StaleFrameError(f"frame {sequence} was overwritten while being copied from {self.name!r}")
+        return sequence, out
+
+    @property
+    def is_closed(self) -> bool:
+        return self.shared_memory.buf is None
+
+    def _unmap(self) -> bool:
+        mapped_arrays = [ref(array) for array in (self.slot_sequences, self._latest_sequence, self.frames)]
+        self.slot_sequences = self._latest_sequence = self.frames = None
+        if any(mapped_array() is not None for mapped_array in mapped_arrays):
+            self._map_arrays()
+            return False
+        self.shared_memory.close()
+        return True
+
+    def close(self) -> None:
+        if self.is_closed:
+            return
+        if not self._unmap():
+            raise BufferError(
+                f"cannot close {self.name!r} while views of its frames are still alive, copy or delete them first"
+            )
+        _unmap_deferred_frame_rings()
+
+    def unlink(self) -> None:
+        self.shared_memory.unlink()
+
+def _unmap_deferred_frame_rings() -> None:
+    for frame_ring in list(_DEFERRED_FRAME_RINGS):
+        if frame_ring.is_closed or frame_ring._unmap():
+            _DEFERRED_FRAME_RINGS.remove(frame_ring)
+
+class SharedFrameSensor(Sensor):
+    def __init__(
+        self,
+        frame_ring:SharedFrameRing,
+        pixel_field:str = "pixels",
+        copy_frames:bool = False,
+    ) -> None:
+        self.frame_ring = frame_ring
+        self.pixel_field = pixel_field
+        self.copy_frames = copy_frames
+        self.last_sequence = 0
+        self.repeated_frames = 0
+
+    def get_observation(self, state:Environment) -> Observation:
+        sequence, frame = (
+            self.frame_ring.copy_frame() if self.copy_frames else self.frame_ring.read()
+        )
+        if sequence == self.last_sequence:
+            self.repeated_frames += 1
+        self.last_sequence = sequence
+        return Observation(
+            **{self.pixel_field: frame},
+            frame_sequence = sequence,
+        )
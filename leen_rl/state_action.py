@@ -1,19 +1,20 @@
 from json import dumps
-from typing import List, Any
-from pandas import read_csv
+from random import randrange, sample
+from collections.abc import Sequence
+from typing import Dict, Hashable, Iterator, List, Any, Optional, Tuple, Union
 import numpy
 #=======================
+from .action_space_cache import read_action_columns
 #=======================
 class BeliefState:
     def __init__(self, **kwargs) -> None:
         self.__dict__ = kwargs
 
     def __str__(self) -> str:
-        return f"""{self.__class__.__name__} = {dumps(
-            self.__dict__,
-            indent=4,
-            default= convert_datatype
-        )}"""
+        return _dump_belief_state(class_name=self.__class__.__name__, fields=self.__dict__)
+
+    def evolve(self, **changes) -> "BeliefState":
+        return _evolve_keyword_state(state=self, changes=changes)
 
 class Observation:
     def __init__(self, **kwargs) -> None:
@@ -22,6 +23,9 @@ class Observation:
     def __str__(self) -> str:
         return f"{self.__class__.__name__} = {self.__dict__}"
 
+    def evolve(self, **changes) -> "Observation":
+        return _evolve_keyword_state(state=self, changes=changes)
+
 class Action:
     def __init__(self, **kwargs) -> None:
         self.__dict__ = kwargs
@@ -29,25 +33,229 @@ class Action:
     def __str__(self) -> str:
         return f"{self.__class__.__name__} = {self.__dict__}"
 
-def load_in_action_space(state_space_address:str) -> List[Action]:
-    return [
-        Action(
-            **kwargs
-        ) for kwargs in read_csv(state_space_address).to_dict(
-            orient='records'
+    def evolve(self, **changes) -> "Action":
+        return _evolve_keyword_state(state=self, changes=changes)
+
+def _evolve_keyword_state(state:Any, changes:Dict[str,Any]) -> Any:
+    evolved_state = object.__new__(state.__class__)
+    evolved_state.__dict__ = {**state.__dict__, **changes}
+    return evolved_state
+
+class StructuredState:
+    __slots__ = ()
+    fields:Tuple[str,...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.fields = tuple(
+            field for klass in reversed(cls.__mro__) 
+            for field in klass.__dict__.get("__slots__", ())
+        )
+
+    def __init__(self, **kwargs) -> None:
+        missing_fields = [field for field in self.fields if field not in kwargs]
+        unexpected_fields = [field for field in kwargs if field not in self.fields]
+        if missing_fields or unexpected_fields:
+            raise TypeError(
+                f"{self.__class__.__name__} expects fields {self.fields} "
+                f"(missing {missing_fields}, unexpected {unexpected_fields})"
+            )
+        for field in self.fields:
+            setattr(self, field, kwargs[field])
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__} = {self.as_dict()}"
+
+    def as_dict(self) -> Dict[str,Any]:
+        return {field: getattr(self, field) for field in self.fields}
+
+    def evolve(self, **changes) -> "StructuredState":
+        evolved_state = object.__new__(self.__class__)
+        for field in self.fields:
+            setattr(
+                evolved_state, 
+                field, 
+                changes.pop(field) if field in changes else getattr(self, field)
+            )
+        if changes:
+            raise TypeError(f"{self.__class__.__name__} has no fields {tuple(changes)}")
+        return evolved_state
+
+class StructuredBeliefState(StructuredState):
+    __slots__ = ()
+
+    def __str__(self) -> str:
+        return _dump_belief_state(class_name=self.__class__.__name__, fields=self.as_dict())
+
+class StructuredObservation(StructuredState):
+    __slots__ = ()
+
+class ActionView(Action):
+    __slots__ = ("_action_space", "_row")
+
+    def __init__(self, action_space:"ActionSpace", row:int) -> None:
+        self._action_space = action_space
+        self._row = row
+
+    def __getattr__(self, name:str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._action_space.get_value(row=self._row, name=name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other:Any) -> bool:
+        return isinstance(other, ActionView) and (
+            other._action_space is self._action_space and other._row == self._row
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._action_space), self._row))
+
+    def __reduce__(self) -> Any:
+        return ActionView, (self._action_space, self._row)
+
+    def __copy__(self) -> "ActionView":
+        return self
+
+    def __deepcopy__(self, memo:Dict[int,Any]) -> "ActionView":
+        return self
+
+    def __str__(self) -> str:
+        return f"{Action.__name__} = {self._action_space.get_values(row=self._row)}"
+
+    def evolve(self, **changes) -> Action:
+        return Action(**{**self._action_space.get_values(row=self._row), **changes})
+
+class ActionSpace(Sequence):
+    def __init__(self, columns:Dict[str,Any]) -> None:
+        self.columns = {name: numpy.asarray(values) for name, values in columns.items()}
+        self.column_names = tuple(self.columns)
+        self._length = len(self.columns[self.column_names[0]]) if self.column_names else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index:Union[int,slice]) -> Union[ActionView,List[ActionView]]:
+        if isinstance(index, slice):
+            return [ActionView(self, row) for row in range(*index.indices(self._length))]
+        row = index + self._length if index < 0 else index
+        if not 0 <= row < self._length:
+            raise IndexError("action space index out of range")
+        return ActionView(self, row)
+
+    def __iter__(self) -> Iterator[ActionView]:
+        for row in range(self._length):
+            yield ActionView(self, row)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(actions={self._length}, columns={self.column_names})"
+
+    def column(self, name:str) -> numpy.ndarray:
+        return self.columns[name]
+
+    def to_array(self, columns:Optional[Sequence] = None) -> numpy.ndarray:
+        names = columns if columns is not None else [
+            name for name in self.column_names 
+            if numpy.issubdtype(self.columns[name].dtype, numpy.number)
+        ]
+        return numpy.column_stack(
+            [self.columns[name].astype(float) for name in names]
+        ) if names else numpy.empty((self._length, 0))
+
+    def get_value(self, row:int, name:str) -> Any:
+        value = self.columns[name][row]
+        return value.item() if isinstance(value, numpy.generic) else value
+
+    def get_values(self, row:int) -> Dict[str,Any]:
+        return {name: self.get_value(row=row, name=name) for name in self.column_names}
+
+    def index_of(self, action:Action) -> int:
+        if isinstance(action, ActionView):
+            if action._action_space is self:
+                return action._row
+            action_values = action._action_space.get_values(row=action._row)
+        else:
+            action_values = action.__dict__
+        for row in range(self._length):
+            if self.get_values(row) == action_values:
+                return row
+        raise ValueError(f"{action} is not in the action space")
+
+    def random_action(self) -> ActionView:
+        return ActionView(self, randrange(self._length))
+
+    def random_actions(self, number_of_actions:int) -> List[ActionView]:
+        return [ActionView(self, randrange(self._length)) for _ in range(number_of_actions)]
+
+    def sample(self, k:int) -> List[ActionView]:
+        return [ActionView(self, row) for row in sample(range(self._length), k)]
+
+def load_in_action_space(state_space_address:str, use_cache:bool = True) -> ActionSpace:
+    return ActionSpace(
+        columns = read_action_columns(
+            action_space_path = state_space_address,
+            use_cache = use_cache,
+        )
+    )
+
+def belief_state_key(
+    belief_state:BeliefState, 
+    fields:Optional[Sequence] = None,
+) -> Hashable:
+    values = _get_fields(belief_state) if fields is None else {
+        field: getattr(belief_state, field) for field in fields
+    }
+    return tuple(
+        (name, _convert_to_hashable(value)) for name, value in sorted(values.items())
+    )
+
+def _convert_to_hashable(value:Any) -> Hashable:
+    if isinstance(value, numpy.ndarray):
+        return (value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_convert_to_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(
+            (key, _convert_to_hashable(item)) for key, item in sorted(value.items())
         )
-    ]
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, ActionView):
+        return value
+    if isinstance(value, (BeliefState, Observation, Action, StructuredState)):
+        return belief_state_key(value)
+    if hasattr(value, "__array__"):
+        return _convert_to_hashable(numpy.asarray(value))
+    if type(value).__hash__ in (None, object.__hash__):
+        raise TypeError(f"{type(value).__name__} is neither hashable by value nor array-like")
+    return value
+
+def _get_fields(state:Union[BeliefState,Observation,StructuredState]) -> Dict[str,Any]:
+    return state.as_dict() if isinstance(state, StructuredState) else state.__dict__
+
+def _dump_belief_state(class_name:str, fields:Dict[str,Any]) -> str:
+    printed_maps:List[str] = []
+    dumped_fields = dumps(
+        fields,
+        indent=4,
+        default= lambda value: convert_datatype(value, printed_maps=printed_maps)
+    )
+    return "\n".join([*printed_maps, f"{class_name} = {dumped_fields}"])
 
-def convert_datatype(value:Any) -> Any:
+def convert_datatype(value:Any, printed_maps:Optional[List[str]] = None) -> Any:
     if _is_numpy_datatype(value):
         if _is_numpy_array(value):
             try:
-                print(
-                    _convert_image_to_ascii(value)
-                )
-                return "<see printed map>"
+                ascii_map = _convert_image_to_ascii(value)
             except:
                 return list(value)
+            if printed_maps is None:
+                print(ascii_map)
+            else:
+                printed_maps.append(ascii_map)
+            return "<see printed map>"
         return value.item() 
     return str(value)
 
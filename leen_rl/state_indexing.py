@@ -0,0 +1,37 @@
+from math import prod
+from typing import Sequence
+from numpy import asarray, int64, ndarray
+#=======================
+#=======================
+
+class MixedRadixEncoder:
+    def __init__(self, sizes:Sequence[int]) -> None:
+        self.sizes = tuple(sizes)
+        self.number_of_states = prod(self.sizes)
+        strides = []
+        stride = 1
+        for size in reversed(self.sizes):
+            strides.append(stride)
+            stride *= size
+        self.strides = asarray(strides[::-1], dtype=int64)
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(sizes={self.sizes}, states={self.number_of_states})"
+
+    def encode(self, values:Sequence[int]) -> int:
+        index = 0
+        for value, size in zip(values, self.sizes):
+            if not 0 <= value < size:
+                raise ValueError(f"{tuple(values)} is outside the state sizes {self.sizes}")
+            index = index*size + int(value)
+        return index
+
+    def encode_batch(self, values:ndarray) -> ndarray:
+        return asarray(values, dtype=int64) @ self.strides
+
+    def decode(self, index:int) -> tuple:
+        values = []
+        for size in reversed(self.sizes):
+            index, value = divmod(index, size)
+            values.append(value)
+        return tuple(reversed(values))
@@ -0,0 +1,104 @@
+from json import dump
+from math import log
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+#=======================
+#=======================
+
+class PhaseTimer:
+    __slots__ = ("count", "total_time", "longest_time", "bucket_counts")
+
+    SHORTEST_TIME = 1e-7
+    BUCKETS_PER_DOUBLING = 4
+    NUMBER_OF_BUCKETS = 128
+    _LOG_BUCKET_WIDTH = log(2) / BUCKETS_PER_DOUBLING
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_time = 0.
+        self.longest_time = 0.
+        self.bucket_counts = [0]*self.NUMBER_OF_BUCKETS
+
+    def record(self, duration:float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration > self.longest_time:
+            self.longest_time = duration
+        bucket = int(log(duration / self.SHORTEST_TIME) / self._LOG_BUCKET_WIDTH) + 1 if duration > self.SHORTEST_TIME else 0
+        self.bucket_counts[min(bucket, self.NUMBER_OF_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction:float) -> float:
+        if not self.count:
+            return 0.
+        rank = fraction * self.count
+        cumulative_count = 0
+        for bucket, bucket_count in enumerate(self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank and bucket_count:
+                upper_bound = self.SHORTEST_TIME * 2 ** (bucket / self.BUCKETS_PER_DOUBLING)
+                return min(upper_bound, self.longest_time)
+        return self.longest_time
+
+    def summary(self) -> Dict[str,float]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total_time,
+            "mean_seconds": self.total_time / self.count if self.count else 0.,
+            "p50_seconds": self.percentile(.5),
+            "p99_seconds": self.percentile(.99),
+            "max_seconds": self.longest_time,
+        }
+
+class StepProfiler:
+    PHASES:Tuple[str,...] = ("get_observation", "get_belief_state", "get_action", "update_state", "step")
+
+    def __init__(self, export_path:Optional[str] = None) -> None:
+        self.export_path = export_path
+        self.phase_timers = {phase: PhaseTimer() for phase in self.PHASES}
+        self.elapsed_time = 0.
+        self._start_time = None
+
+    def __str__(self) -> str:
+        lines = [f"{self.__class__.__name__} ({self.steps_per_second():.1f} steps/sec)"]
+        for phase, timer in self.phase_timers.items():
+            if timer.count:
+                lines.append(
+                    f"  {phase:<17} n={timer.count:<8} "
+                    f"p50={timer.percentile(.5)*1e3:.3f}ms "
+                    f"p99={timer.percentile(.99)*1e3:.3f}ms "
+                    f"total={timer.total_time:.3f}s"
+                )
+        return "\n".join(lines)
+
+    def record(self, phase:str, duration:float) -> None:
+        timer = self.phase_timers.get(phase)
+        if timer is None:
+            timer = self.phase_timers[phase] = PhaseTimer()
+        timer.record(duration)
+
+    def start(self) -> None:
+        self._start_time = perf_counter()
+
+    def stop(self) -> None:
+        if self._start_time is not None:
+            self.elapsed_time += perf_counter() - self._start_time
+            self._start_time = None
+        if self.export_path:
+            self.export(self.export_path)
+
+    def steps_per_second(self) -> float:
+        number_of_steps = self.phase_timers["step"].count
+        return number_of_steps / self.elapsed_time if self.elapsed_time else 0.
+
+    def summary(self) -> Dict[str,object]:
+        return {
+            "steps_per_second": self.steps_per_second(),
+            "elapsed_seconds": self.elapsed_time,
+            "phases": {
+                phase: timer.summary() for phase, timer in self.phase_timers.items() if timer.count
+            },
+        }
+
+    def export(self, path:str) -> None:
+        with open(path, "w") as summary_file:
+            dump(self.summary(), summary_file, indent=4)